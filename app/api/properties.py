@@ -4,6 +4,7 @@ Property Discovery API endpoints.
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Annotated
 import logging
+import math
 
 from app.models.property import (
     PropertyDiscoveryRequest,
@@ -24,13 +25,62 @@ from app.api.auth import get_current_user
 from app.services.airbnb_parser import AirbnbURLParser
 from app.integrations.apify_client import ApifyClient
 from app.services.booking_detector import BookingDetector
-from app.services.property_fetcher import PropertyFetcher
+from app.services.property_fetcher import (
+    get_property_fetcher,
+    PropertyFetchError,
+    InvalidUrlError,
+    ScrapeTimeoutError,
+    UpstreamHTTPError,
+    RetryableScrapeError
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _property_fetch_http_error(e: PropertyFetchError) -> HTTPException:
+    """
+    Map a property fetch error to the HTTP error returned to the client.
+    
+    Only an invalid URL is the client's fault (400). Timeouts are 504,
+    throttling is 503 with Retry-After, and other upstream failures are 502.
+    
+    Args:
+        e: Error raised by PropertyFetcher
+        
+    Returns:
+        HTTPException to raise
+    """
+    if isinstance(e, InvalidUrlError):
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid property URL: {str(e)}"
+        )
+    
+    logger.warning(f"Property details fetch failed: {str(e)}")
+    if isinstance(e, ScrapeTimeoutError):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Timed out fetching property details: {str(e)}"
+        )
+    if isinstance(e, RetryableScrapeError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Airbnb is rate limiting requests, try again later: {str(e)}",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+    if isinstance(e, UpstreamHTTPError):
+        return HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Airbnb could not be reached: {str(e)}"
+        )
+    return HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail=f"Unable to fetch property details: {str(e)}"
+    )
+
+
 @router.post("/discover", response_model=PropertyDiscoveryResponse)
 async def discover_properties(
     request: PropertyDiscoveryRequest,
@@ -51,7 +101,8 @@ async def discover_properties(
         PropertyDiscoveryResponse with discovered properties
         
     Raises:
-        HTTPException: 400 for invalid URL, 500 for scraping errors
+        HTTPException: 400 for invalid URL, 502/503/504 when Airbnb fails,
+            500 for other scraping errors
     """
     try:
         # Check if this is a specific property URL (contains /rooms/)
@@ -94,8 +145,7 @@ async def discover_properties(
                 )
             
             # Fetch property details
-            apify_client = ApifyClient()
-            fetcher = PropertyFetcher(apify_client)
+            fetcher = get_property_fetcher()
             property_details = await fetcher.fetch_property_details(
                 property_url=request.searchUrl,
                 check_in=check_in,
@@ -192,6 +242,10 @@ async def discover_properties(
             count=len(properties)
         )
         
+    except HTTPException:
+        raise
+    except PropertyFetchError as e:
+        raise _property_fetch_http_error(e)
     except ValueError as e:
         # Handle parsing errors from AirbnbURLParser
         raise HTTPException(
@@ -477,16 +531,16 @@ async def fetch_property_details(
         PropertyDetailsFetchResponse with property details and availability
         
     Raises:
-        HTTPException: 400 for invalid URL, 500 for fetch errors
+        HTTPException: 400 for invalid URL, 502/503/504 when Airbnb fails,
+            500 for other fetch errors
     """
     try:
         logger.info(
             f"User {current_user.email} fetching property details from URL: {request.propertyUrl}"
         )
         
-        # Initialize property fetcher with Apify client
-        apify_client = ApifyClient()
-        fetcher = PropertyFetcher(apify_client)
+        # Use the shared property fetcher
+        fetcher = get_property_fetcher()
         
         # Fetch property details
         property_details = await fetcher.fetch_property_details(
@@ -502,8 +556,10 @@ async def fetch_property_details(
         
         return property_details
         
+    except PropertyFetchError as e:
+        raise _property_fetch_http_error(e)
     except ValueError as e:
-        logger.error(f"Invalid property URL or fetch failed: {str(e)}")
+        logger.error(f"Invalid property details request: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid property URL or unable to fetch details: {str(e)}"
@@ -1,3 +1,5 @@
+from functools import cached_property, lru_cache
+from pydantic import PrivateAttr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
@@ -30,17 +32,69 @@ class Settings(BaseSettings):
     APIFY_API_URL: str = "https://api.apify.com/v2"
     APIFY_TIMEOUT: int = 300  # 5 minutes timeout for scraping operations
     
+    # BrightData Configuration (used by verify_brightdata.py)
+    BRIGHTDATA_API_KEY: str = ""
+    BRIGHTDATA_DATASET_ID: str = "gd_l7q7dkf244hwjntr0"  # Airbnb dataset
+    BRIGHTDATA_API_URL: str = "https://api.brightdata.com/datasets/v3"
+    BRIGHTDATA_TIMEOUT: int = 300
+    
+    # Whether the BrightData settings are complete enough for real scraping,
+    # worked out once when settings are loaded
+    _brightdata_ready: bool = PrivateAttr(default=False)
+    
+    # Redis (optional, shares notification dedup across app instances)
+    REDIS_URL: str = ""
+    
+    # Launch the browser pool at startup. Off by default: every worker process
+    # would start its own browsers, and they are recycled after a few minutes.
+    BROWSER_WARMUP: bool = False
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=True
     )
     
+    @model_validator(mode="after")
+    def _check_brightdata(self) -> "Settings":
+        """Record whether BrightData has a key, dataset, HTTP(S) URL and timeout"""
+        self._brightdata_ready = bool(
+            self.BRIGHTDATA_API_KEY
+            and self.BRIGHTDATA_DATASET_ID
+            and self.BRIGHTDATA_API_URL.startswith(("https://", "http://"))
+            and self.BRIGHTDATA_TIMEOUT > 0
+        )
+        return self
+    
+    @property
+    def brightdata_ready(self) -> bool:
+        """Whether BrightData is configured for real (non-mock) scraping"""
+        return self._brightdata_ready
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS_ORIGINS string into list"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    
+    @cached_property
+    def brightdata_api_key_masked(self) -> str:
+        """BrightData API key with all but the first and last 8 characters hidden"""
+        key = self.BRIGHTDATA_API_KEY
+        if len(key) > 16:
+            return "...".join((key[:8], key[-8:]))
+        return key
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings from the environment and .env file once per process.
+    
+    Returns:
+        Cached Settings instance
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
@@ -10,15 +10,34 @@ MAX_ACTIVE_WATCHES_PER_USER = 5
 
 # Notification Settings
 NOTIFICATION_COOLDOWN_HOURS = 24
+USER_CACHE_TTL_SECONDS = 60  # Scan processor cache of notification recipients
 
 # Scheduler Settings
-SCHEDULER_CHECK_INTERVAL_SECONDS = 60
+SCHEDULER_CHECK_INTERVAL_SECONDS = 60  # Longest sleep between due-watch checks
+SCHEDULER_FALLBACK_INTERVAL_SECONDS = 300  # Longest sleep while the watches change stream is open
+SCHEDULER_MIN_SLEEP_SECONDS = 1
+SCAN_CONCURRENCY = 10  # Number of scan worker tasks
+SCAN_LEASE_MARGIN_SECONDS = 60  # Lease time beyond the scan timeout before a claimed watch can be reclaimed
+WATCH_SCAN_TIMEOUT_MARGIN_SECONDS = 60  # Added to the Apify request and polling budget to get the scan timeout
+SCAN_LOG_BATCH_SIZE = 100
+SCAN_LOG_FLUSH_INTERVAL_SECONDS = 5
+WATCH_UPDATE_BATCH_SIZE = 100
+SCAN_CPU_WORKERS = 2  # Threads formatting notifications and scan logs off the event loop
 
 # Scan Frequency Settings
 DAILY_SCAN_HOUR = 12  # Noon (UTC)
 HOURLY_SCAN_INTERVAL_HOURS = 1
 SNIPER_SCAN_INTERVAL_MINUTES = 5
 
+# Property Fetch Settings
+PROPERTY_DETAILS_CACHE_TTL_SECONDS = 60
+SCRAPE_MAX_ATTEMPTS = 3
+SCRAPE_RETRY_BASE_DELAY_SECONDS = 1
+SCRAPE_MAX_RETRY_DELAY_SECONDS = 30
+HTML_PARSE_WORKERS = 2  # Threads parsing fallback HTML off the event loop
+BROWSER_POOL_SIZE = 4  # Concurrent Playwright scrapes (one browser each)
+AIRBNB_MAX_CONCURRENCY = BROWSER_POOL_SIZE  # AIMD ceiling; more fetches than pool slots would only queue
+
 # Polling Settings
 MAX_POLL_ATTEMPTS = 30
 POLL_INTERVAL_SECONDS = 2
@@ -90,4 +90,28 @@ def get_database() -> AsyncIOMotorDatabase:
         db_name = "bnbalerts"  # Default database name
         logger.warning(f"No database name in URI, using default: {db_name}")
     
-    return mongodb_client[db_name]
\ No newline at end of file
+    return mongodb_client[db_name]
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """
+    Create the indexes the background services rely on.
+    
+    The scheduler polls for active watches whose nextScanAt has passed, so
+    watches get a compound index on (status, nextScanAt). It is partial on
+    status == "active" because only active watches are ever polled, which
+    keeps the index small enough to stay in RAM.
+    
+    Args:
+        db: MongoDB database instance
+        
+    Note:
+        create_index is a no-op when an identical index already exists,
+        so this is safe to call on every startup.
+    """
+    await db.watches.create_index(
+        [("status", 1), ("nextScanAt", 1)],
+        name="active_due_watches",
+        partialFilterExpression={"status": "active"}
+    )
+    logger.info("Ensured MongoDB indexes")
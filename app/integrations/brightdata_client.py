@@ -6,7 +6,8 @@ for extracting Airbnb property data.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime, date
 import logging
 import random
@@ -22,6 +23,12 @@ from app.core.constants import (
     POLL_INTERVAL_SECONDS
 )
 
+try:
+    # orjson decodes large snapshot payloads several times faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -289,7 +296,7 @@ class BrightDataClient:
                     )
                 
                 # Parse the response
-                response_data = response.json()
+                response_data = json_loads(response.content)
                 logger.info(f"BrightData collection triggered successfully")
                 logger.debug(f"Response data: {response_data}")
                 
@@ -300,7 +307,7 @@ class BrightDataClient:
                 
                 # Poll for results (BrightData processes asynchronously)
                 logger.info(f"Polling for results with snapshot_id: {snapshot_id}")
-                properties = await self._poll_for_results(client, snapshot_id, headers)
+                properties = await self._poll_for_results(client, snapshot_id, headers, max_results)
                 
                 logger.info(f"Successfully scraped {len(properties)} properties from BrightData")
                 return properties
@@ -322,6 +329,7 @@ class BrightDataClient:
         client: httpx.AsyncClient,
         snapshot_id: str,
         headers: Dict[str, str],
+        max_results: Optional[int] = None,
         max_attempts: int = MAX_POLL_ATTEMPTS,
         poll_interval: int = POLL_INTERVAL_SECONDS
     ) -> List[Dict[str, Any]]:
@@ -332,6 +340,7 @@ class BrightDataClient:
             client: HTTP client instance
             snapshot_id: The snapshot ID to poll for
             headers: Request headers with authentication
+            max_results: Maximum number of properties to return (all if None)
             max_attempts: Maximum number of polling attempts
             poll_interval: Seconds to wait between polls
             
@@ -349,14 +358,14 @@ class BrightDataClient:
                 response = await client.get(results_url, headers=headers)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = json_loads(response.content)
                     status = data.get("status")
                     
                     if status == "ready":
                         # Results are ready, extract and transform them
                         logger.info(f"Results ready after {attempt + 1} attempts")
                         raw_results = data.get("data", [])
-                        return self._transform_api_response(raw_results)
+                        return self._transform_api_response(raw_results, max_results)
                     
                     elif status in ["running", "pending"]:
                         # Still processing, wait and retry
@@ -396,20 +405,38 @@ class BrightDataClient:
             f"Results not ready after {max_attempts * poll_interval} seconds"
         )
     
-    def _transform_api_response(self, api_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _transform_api_response(
+        self,
+        api_data: List[Dict[str, Any]],
+        max_results: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Transform BrightData API response to match PropertyCreate schema.
         
         BrightData returns Airbnb data in their specific format. This method
-        transforms it to match our application's property schema.
+        transforms it to match our application's property schema. Items are
+        transformed lazily, so those past max_results are never processed.
         
         Args:
             api_data: Raw API response data (list of property objects)
+            max_results: Maximum number of properties to return (all if None)
             
         Returns:
             List of transformed property dictionaries matching PropertyCreate schema
         """
-        properties = []
+        return list(islice(self._iter_api_properties(api_data), max_results))
+    
+    def _iter_api_properties(self, api_data: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Transform raw BrightData items one at a time, skipping malformed ones.
+        
+        Args:
+            api_data: Raw API response data (list of property objects)
+            
+        Yields:
+            Property dictionaries matching PropertyCreate schema
+        """
+        transformed = 0
         
         for item in api_data:
             try:
@@ -471,7 +498,7 @@ class BrightDataClient:
                 
                 # Build the property data object
                 property_data = {
-                    "propertyId": str(property_id) if property_id else f"unknown_{len(properties)}",
+                    "propertyId": str(property_id) if property_id else f"unknown_{transformed}",
                     "propertyName": property_name,
                     "propertyUrl": property_url or "https://www.airbnb.com",
                     "location": location,
@@ -482,13 +509,12 @@ class BrightDataClient:
                     "checkOutDate": check_out,
                 }
                 
-                properties.append(property_data)
-                
             except Exception as e:
                 logger.warning(f"Failed to transform property data: {str(e)}, item: {item}")
                 continue
-        
-        return properties
+            
+            transformed += 1
+            yield property_data
     
     async def health_check(self) -> bool:
         """
@@ -510,6 +536,23 @@ class BrightDataClient:
             return False
 
 
+# Process-wide client configured from settings
+_brightdata_client: Optional[BrightDataClient] = None
+
+
+def get_brightdata_client() -> BrightDataClient:
+    """
+    Get the shared BrightDataClient, creating it from settings on first use.
+    
+    Returns:
+        BrightDataClient shared across callers
+    """
+    global _brightdata_client
+    if _brightdata_client is None:
+        _brightdata_client = BrightDataClient()
+    return _brightdata_client
+
+
 # Convenience function for quick scraping
 async def scrape_airbnb_properties(
     parsed_data: ParsedAirbnbData,
@@ -528,5 +571,4 @@ async def scrape_airbnb_properties(
     Raises:
         BrightDataScrapingError: If scraping fails
     """
-    client = BrightDataClient()
-    return await client.scrape_properties(parsed_data, max_results)
\ No newline at end of file
+    return await get_brightdata_client().scrape_properties(parsed_data, max_results)
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""
+Playwright Browser Pool
+
+Launching Chromium costs hundreds of milliseconds and ~150MB per call, so
+property page scraping reuses a small pool of long-lived browsers and hands
+out a fresh BrowserContext for every scrape. Browsers are recycled after a
+number of pages or a maximum age to keep memory bounded.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional
+
+from app.core.constants import BROWSER_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Chromium launch arguments
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--no-sandbox',
+]
+
+# Options for the per-scrape context: realistic user agent and locale, a
+# modest viewport to keep layout cheap, and CSP bypass so page.evaluate runs
+CONTEXT_OPTIONS = {
+    'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'viewport': {'width': 1280, 'height': 800},
+    'java_script_enabled': True,
+    'bypass_csp': True,
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+    'extra_http_headers': {
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    },
+}
+
+
+class BrowserInstance:
+    """A launched browser together with its usage counters."""
+
+    def __init__(self, browser: Any):
+        """
+        Initialize the browser instance.
+
+        Args:
+            browser: Playwright Browser
+        """
+        self.browser = browser
+        self.pages_processed = 0
+        self.created_at = time.monotonic()
+        self.warm_contexts: List[Any] = []
+
+
+class BrowserPool:
+    """
+    Pool of Chromium browsers shared by all scrapes in the process.
+
+    Each acquire() borrows one browser, creates an isolated context on it and
+    closes the context afterwards. At most `size` scrapes run concurrently.
+    Browsers that exceed `max_pages_per_browser` or `max_age_seconds` are
+    closed and replaced on the next acquire.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        max_pages_per_browser: int = 50,
+        max_age_seconds: int = 300
+    ):
+        """
+        Initialize the browser pool. No browser is launched until first use.
+
+        Args:
+            size: Maximum number of concurrent scrapes (and browsers)
+            max_pages_per_browser: Recycle a browser after this many scrapes
+            max_age_seconds: Recycle a browser after this many seconds
+        """
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_age_seconds = max_age_seconds
+        self._playwright: Optional[Any] = None
+        self._playwright_lock = asyncio.Lock()
+        self._idle: List[BrowserInstance] = []
+        self._semaphore = asyncio.Semaphore(size)
+        self._closed = False
+
+    async def _create_instance(self) -> BrowserInstance:
+        """
+        Launch a new Chromium browser.
+
+        Raises:
+            ImportError: If Playwright is not installed
+        """
+        async with self._playwright_lock:
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+
+        browser = await self._playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+        logger.info("Launched pooled browser")
+        return BrowserInstance(browser)
+
+    def _is_expired(self, instance: BrowserInstance) -> bool:
+        """Check whether a browser should be recycled."""
+        return (
+            not instance.browser.is_connected()
+            or instance.pages_processed >= self.max_pages_per_browser
+            or time.monotonic() - instance.created_at >= self.max_age_seconds
+        )
+
+    async def _close_instance(self, instance: BrowserInstance) -> None:
+        """Close a browser, ignoring errors from already-dead processes."""
+        try:
+            await instance.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+
+    async def _checkout(self) -> BrowserInstance:
+        """Take an idle browser, launching a new one if none is usable."""
+        while self._idle:
+            instance = self._idle.pop()
+            if not self._is_expired(instance):
+                return instance
+            await self._close_instance(instance)
+        return await self._create_instance()
+
+    async def _checkin(self, instance: BrowserInstance) -> None:
+        """Return a browser to the pool, or close it if it is due for recycling."""
+        if self._closed:
+            await self._close_instance(instance)
+        elif self._is_expired(instance):
+            logger.info(f"Recycling pooled browser after {instance.pages_processed} pages")
+            await self._close_instance(instance)
+        else:
+            self._idle.append(instance)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """
+        Borrow a fresh browser context for a single scrape.
+
+        Usage:
+            async with pool.acquire() as context:
+                page = await context.new_page()
+
+        Yields:
+            Playwright BrowserContext, closed automatically on exit
+        """
+        async with self._semaphore:
+            instance = await self._checkout()
+            try:
+                if instance.warm_contexts:
+                    context = instance.warm_contexts.pop()
+                else:
+                    context = await instance.browser.new_context(**CONTEXT_OPTIONS)
+                try:
+                    yield context
+                finally:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        logger.warning(f"Error closing browser context: {e}")
+                    instance.pages_processed += 1
+            finally:
+                await self._checkin(instance)
+
+    async def _create_warm_instance(self) -> BrowserInstance:
+        """Launch a browser with one context and page already open."""
+        instance = await self._create_instance()
+        context = await instance.browser.new_context(**CONTEXT_OPTIONS)
+        await context.new_page()
+        instance.warm_contexts.append(context)
+        return instance
+
+    async def start(self) -> None:
+        """
+        Launch `size` browsers in parallel, each with a ready context and page.
+
+        Called at application startup so the first scrapes skip both the
+        Chromium launch and context creation.
+
+        Raises:
+            ImportError: If Playwright is not installed
+            Exception: If no browser could be launched
+        """
+        results = await asyncio.gather(
+            *[self._create_warm_instance() for _ in range(self.size)],
+            return_exceptions=True
+        )
+        instances = [r for r in results if isinstance(r, BrowserInstance)]
+        errors = [r for r in results if not isinstance(r, BrowserInstance)]
+        self._idle.extend(instances)
+
+        if errors and not instances:
+            raise errors[0]
+        if errors:
+            logger.warning(f"Started {len(instances)}/{self.size} pooled browsers: {errors[0]}")
+        else:
+            logger.info(f"Started {len(instances)} pooled browsers")
+
+    async def stop(self) -> None:
+        """
+        Close all idle browsers and stop Playwright.
+
+        Should be called during application shutdown to avoid leaving
+        Chromium processes behind.
+        """
+        self._closed = True
+        instances, self._idle = self._idle, []
+        for instance in instances:
+            await self._close_instance(instance)
+
+        try:
+            if self._playwright is not None:
+                await self._playwright.stop()
+            logger.info("Browser pool closed")
+        except Exception as e:
+            logger.error(f"Error stopping Playwright: {str(e)}")
+        finally:
+            self._playwright = None
+
+
+# Global browser pool instance
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get the process-wide browser pool, creating it on first use.
+
+    Returns:
+        Shared BrowserPool instance
+    """
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(size=BROWSER_POOL_SIZE)
+    return _browser_pool
@@ -187,6 +187,7 @@ class PropertyDetailsFetchResponse(BaseModel):
     
     class Config:
         populate_by_name = True
+        frozen = True
         json_encoders = {
             date: lambda v: v.isoformat()
         }
\ No newline at end of file
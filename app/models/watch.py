@@ -2,8 +2,9 @@
 Watch models for the application.
 """
 from datetime import datetime, date, time
+from functools import cached_property
 from typing import Optional, Annotated, Any
-from pydantic import BaseModel, Field, field_validator, BeforeValidator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, BeforeValidator
 from bson import ObjectId
 
 
@@ -96,10 +97,35 @@ class WatchInDB(BaseModel):
     status: str = Field(default="active", description="Watch status")
     lastScannedAt: Optional[datetime] = Field(None, description="Last scan timestamp")
     nextScanAt: Optional[datetime] = Field(None, description="Next scheduled scan")
+    lastNotificationSent: Optional[datetime] = Field(None, description="Last availability notification timestamp")
     expiresAt: datetime = Field(..., description="Auto-expire at check-in date 23:59:59")
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
     
+    # ObjectId form of `id`, parsed at most once per instance
+    _object_id: Optional[ObjectId] = PrivateAttr(default=None)
+    
+    @cached_property
+    def checkInDateDT(self) -> datetime:
+        """Check-in date as a midnight datetime, the form MongoDB stores."""
+        if type(self.checkInDate) is date:
+            return datetime.combine(self.checkInDate, time.min)
+        return self.checkInDate
+    
+    @cached_property
+    def checkOutDateDT(self) -> datetime:
+        """Check-out date as a midnight datetime, the form MongoDB stores."""
+        if type(self.checkOutDate) is date:
+            return datetime.combine(self.checkOutDate, time.min)
+        return self.checkOutDate
+    
+    @property
+    def object_id(self) -> ObjectId:
+        """MongoDB ObjectId of this watch, for use in queries."""
+        if self._object_id is None:
+            self._object_id = ObjectId(self.id)
+        return self._object_id
+    
     class Config:
         populate_by_name = True
         json_encoders = {
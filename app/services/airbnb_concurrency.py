@@ -0,0 +1,142 @@
+"""
+Airbnb Concurrency Controller
+
+Adaptive (AIMD) limit on concurrent fetches against airbnb.com. The limit
+grows additively while fetches stay fast and is cut multiplicatively when
+Airbnb throttles us (429/5xx or timeouts), so alert fan-out does not trigger
+rate-limit storms.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AirbnbConcurrency:
+    """
+    Additive-increase / multiplicative-decrease concurrency limiter.
+
+    Callers hold a slot for the duration of one fetch. Every `window`
+    successful fetches, the limit is raised by `alpha` if their mean latency
+    is within `target_latency`, or, when no target is given, within
+    `latency_tolerance` times the baseline (a moving average of past window
+    means). A throttling signal multiplies the limit by `beta`, at most once
+    per `decrease_cooldown` seconds so fetches failing together count once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        target_latency: Optional[float] = None,
+        latency_tolerance: float = 1.5,
+        window: int = 32,
+        decrease_cooldown: float = 20.0,
+        max_pause: float = 30.0
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            initial: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            alpha: Additive increase applied per healthy window
+            beta: Multiplicative decrease applied on throttling
+            target_latency: Mean latency (seconds) below which the limit grows;
+                derived from the observed baseline when None
+            latency_tolerance: Multiple of the baseline latency still treated
+                as healthy when target_latency is None
+            window: Number of latency samples per adjustment
+            decrease_cooldown: Minimum seconds between two limit cuts
+            max_pause: Longest Retry-After pause (seconds) applied to new fetches
+        """
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.latency_tolerance = latency_tolerance
+        self.decrease_cooldown = decrease_cooldown
+        self.max_pause = max_pause
+        self._latencies = deque(maxlen=window)
+        # Moving average of window mean latencies, set by the first full window
+        self._baseline_latency: Optional[float] = None
+        # Monotonic time of the last limit cut
+        self._last_decrease = float("-inf")
+        self._in_use = 0
+        self._condition = asyncio.Condition()
+        # Monotonic time before which no new fetch should start (Retry-After)
+        self._resume_at = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for and hold one concurrency slot."""
+        # Bounded so a resume time set before max_pause changed cannot stall callers
+        delay = min(self._resume_at - time.monotonic(), self.max_pause)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_use < int(self.limit))
+            self._in_use += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_use -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """
+        Record a successful fetch and grow the limit after a healthy window.
+
+        Args:
+            latency: Fetch duration in seconds
+        """
+        self._latencies.append(latency)
+        if len(self._latencies) < self._latencies.maxlen:
+            return
+
+        mean_latency = sum(self._latencies) / len(self._latencies)
+        self._latencies.clear()
+
+        target_latency = self.target_latency
+        if target_latency is None:
+            if self._baseline_latency is None:
+                self._baseline_latency = mean_latency
+            target_latency = self._baseline_latency * self.latency_tolerance
+            self._baseline_latency = 0.8 * self._baseline_latency + 0.2 * mean_latency
+
+        if mean_latency <= target_latency and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + self.alpha)
+            logger.info(f"Airbnb concurrency raised to {self.limit:.1f} (mean latency {mean_latency:.2f}s)")
+
+    def on_throttle(self, retry_after: float = 0.0) -> None:
+        """
+        Record a throttling signal (429/5xx/timeout) and cut the limit,
+        unless it was already cut within decrease_cooldown.
+
+        Args:
+            retry_after: Seconds Airbnb asked us to wait before new requests,
+                capped at max_pause
+        """
+        now = time.monotonic()
+        retry_after = min(retry_after, self.max_pause)
+        if retry_after > 0:
+            self._resume_at = max(self._resume_at, now + retry_after)
+        self._latencies.clear()
+
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.beta)
+        logger.warning(f"Airbnb throttling detected, concurrency reduced to {self.limit:.1f}")
@@ -5,14 +5,264 @@ This service fetches property details from a specific Airbnb property URL
 and checks availability for given dates.
 """
 import re
+import asyncio
+import time
 import logging
-from datetime import date
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlencode
+import httpx
+from typing import Optional, Dict, Any, List, Tuple, Union
+from selectolax.lexbor import LexborHTMLParser
 from app.integrations.apify_client import ApifyClient
+from app.integrations.browser_pool import get_browser_pool
 from app.models.property import PropertyDetailsFetchResponse
+from app.core.constants import (
+    PROPERTY_DETAILS_CACHE_TTL_SECONDS,
+    SCRAPE_MAX_ATTEMPTS,
+    SCRAPE_RETRY_BASE_DELAY_SECONDS,
+    SCRAPE_MAX_RETRY_DELAY_SECONDS,
+    HTML_PARSE_WORKERS,
+    AIRBNB_MAX_CONCURRENCY
+)
+from app.services.airbnb_concurrency import AirbnbConcurrency
+
+try:
+    # orjson parses the large embedded page state several times faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    class PlaywrightTimeoutError(Exception):
+        """Placeholder so timeouts can be matched when Playwright is absent."""
 
 logger = logging.getLogger(__name__)
 
+# Property ID in listing URLs such as https://www.airbnb.com/rooms/12345678
+_ROOM_ID_RE = re.compile(r'/rooms/(\d+)')
+
+# Airbnb's server-rendered listing state embedded in the page body
+_DEFERRED_STATE_RE = re.compile(r'<script[^>]*id="data-deferred-state[^"]*"[^>]*>([^<]+)</script>')
+
+# Object in the deferred state holding the listing's share card, and the
+# property_data fields read from it
+_SHARING_CONFIG_KEY = 'sharingConfig'
+_STATE_FIELDS = {'name': 'title', 'location': 'location', 'image_url': 'imageUrl'}
+
+# End of the document head; metadata parsing stops here
+_HEAD_CLOSE = b'</head>'
+
+# Location phrases in the og:description, e.g. "... in City, State" or "Located in City"
+_LOCATION_RES = (
+    re.compile(r'in\s+([A-Z][^.!?]+(?:,\s*[A-Z][^.!?]+)?)'),
+    re.compile(r'Located\s+in\s+([^.!?]+)'),
+)
+
+# Availability flags in the page's embedded JSON
+_AVAILABLE_TRUE_RE = re.compile(r'"available"\s*:\s*true', re.IGNORECASE)
+_AVAILABLE_FALSE_RE = re.compile(r'"available"\s*:\s*false', re.IGNORECASE)
+
+# In-page extraction of every field the scraper needs: one CDP round-trip
+# instead of a query_selector/inner_text pair per selector
+_EXTRACT_JS = """(selectors) => {
+    const text = (el) => (el ? el.innerText || '' : '').trim();
+    const first = (list) => list.map(s => document.querySelector(s));
+    const location = first(selectors.location).find(el => text(el));
+    const price = first(selectors.price)
+        .concat([Array.from(document.querySelectorAll('span')).find(el => text(el).includes('$'))])
+        .find(el => text(el).includes('$'));
+    const image = first(selectors.image)
+        .find(el => el && (el.getAttribute('src') || '').includes('pictures'));
+    return {
+        name: text(document.querySelector('h1')),
+        title: document.title,
+        location: location ? text(location) : null,
+        price: price ? text(price) : null,
+        imageUrl: image ? image.getAttribute('src') : null,
+        available: Array.from(document.querySelectorAll('button'))
+            .some(b => /Reserve|Book|Request to book/.test(b.innerText)),
+        unavailable: document.body.innerText.includes("This place isn't available"),
+        deferredState: document.querySelector('script[id^="data-deferred-state"]')?.textContent || null,
+    };
+}"""
+
+# Candidate selectors per field, tried in order inside _EXTRACT_JS
+_LOCATION_SELECTORS = ('[data-section-id="LOCATION_DEFAULT"]', 'button[aria-label*="location"]')
+_PRICE_SELECTORS = ('[data-testid="price-item-value"]', 'div._1jo4hgw')
+_IMAGE_SELECTORS = ('img[data-original-uri]', 'picture img', 'img[src*="pictures"]')
+_EXTRACT_SELECTORS = {
+    'location': list(_LOCATION_SELECTORS),
+    'price': list(_PRICE_SELECTORS),
+    'image': list(_IMAGE_SELECTORS),
+}
+
+# Selectors waited on before extraction, built once as plain strings so no
+# Locator/filter objects are constructed per scrape
+_TITLE_SELECTOR = 'h1'
+_RESERVE_BUTTON_SELECTOR = 'button:text-matches("Reserve|Book|Request to book") >> nth=0'
+
+# Resource types the scraper never reads; aborted to save bandwidth and layout work
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media"})
+
+# Status codes Airbnb returns when it is rate limiting or overloaded
+_THROTTLE_STATUS_CODES = frozenset({429, 502, 503})
+
+# Throttling responses that carry Retry-After and are worth retrying
+_RETRYABLE_STATUS_CODES = frozenset({429, 503})
+
+# Browser-like headers for the httpx fallback. Accept-Encoding is left to
+# httpx, which advertises br/zstd only when their decoders are installed.
+_DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+# Process-wide fetcher instance shared by API requests
+_property_fetcher: Optional["PropertyFetcher"] = None
+
+
+class PropertyFetchError(ValueError):
+    """Base exception for property details fetch errors"""
+    pass
+
+
+class InvalidUrlError(PropertyFetchError):
+    """Exception raised when a URL does not contain an Airbnb room ID"""
+    pass
+
+
+class ScrapeTimeoutError(PropertyFetchError):
+    """Exception raised when the property page does not load in time"""
+    pass
+
+
+class UpstreamHTTPError(PropertyFetchError):
+    """Exception raised when the request to Airbnb fails at the HTTP level"""
+    pass
+
+
+class RetryableScrapeError(UpstreamHTTPError):
+    """Exception raised when Airbnb throttles a fetch and it should be retried later"""
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(headers: httpx.Headers) -> float:
+    """
+    Read how long to back off from Retry-After or x-ratelimit-reset headers.
+    
+    Retry-After may be delta-seconds or an HTTP date; x-ratelimit-reset may be
+    delta-seconds or a Unix timestamp.
+    
+    Returns:
+        Seconds to wait, or SCRAPE_RETRY_BASE_DELAY_SECONDS if absent/invalid
+    """
+    value = headers.get('retry-after')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    
+    value = headers.get('x-ratelimit-reset')
+    if value:
+        try:
+            reset = float(value)
+            if reset > 1_000_000_000:
+                reset -= time.time()
+            return max(0.0, reset)
+        except ValueError:
+            pass
+    
+    return float(SCRAPE_RETRY_BASE_DELAY_SECONDS)
+
+
+def _og_content(tree: LexborHTMLParser, prop: str) -> Optional[str]:
+    """Get the content attribute of an og:* meta tag, if present."""
+    node = tree.css_first(f'meta[property="og:{prop}"]')
+    return node.attributes.get('content') if node else None
+
+
+@lru_cache(maxsize=4096)
+def _extract_property_id(property_url: str) -> str:
+    """Extract the property ID from an Airbnb URL (cached per URL)."""
+    # Match patterns like:
+    # https://www.airbnb.com/rooms/12345678
+    # https://airbnb.com/rooms/12345678?...
+    # https://www.airbnb.com/rooms/12345678/...
+    match = _ROOM_ID_RE.search(property_url)
+    
+    if not match:
+        raise InvalidUrlError(f"Could not extract property ID from URL: {property_url}")
+    
+    property_id = match.group(1)
+    logger.info("Extracted property ID: %s from URL: %s", property_id, property_url)
+    return property_id
+
+
+def _find_object(node: Any, key: str) -> Optional[Dict[str, Any]]:
+    """Depth-first search of decoded JSON for the first object stored under `key`."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            value = current.get(key)
+            if isinstance(value, dict):
+                return value
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return None
+
+
+def _parse_deferred_state(raw: str) -> Dict[str, Any]:
+    """
+    Extract listing fields from Airbnb's embedded deferred-state JSON.
+    
+    Args:
+        raw: Text content of the data-deferred-state script
+        
+    Returns:
+        Subset of property_data fields found in the state (may be empty)
+    """
+    try:
+        state = json_loads(raw)
+    except ValueError:
+        return {}
+    
+    sharing = _find_object(state, _SHARING_CONFIG_KEY)
+    if not sharing:
+        return {}
+    
+    return {
+        field: sharing[key].strip()
+        for field, key in _STATE_FIELDS.items()
+        if isinstance(sharing.get(key), str) and sharing[key].strip()
+    }
+
+
+async def _block_heavy_resources(route) -> None:
+    """Playwright route handler that aborts non-essential resource requests."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class PropertyFetcher:
     """Service for fetching property details from Airbnb URLs."""
@@ -25,8 +275,81 @@ class PropertyFetcher:
             apify_client: Apify client for scraping
         """
         self.apify_client = apify_client
+        # In-flight fetches keyed by (property_id, check_in, check_out)
+        self._inflight: Dict[Tuple[str, date, date], asyncio.Future] = {}
+        # Recent responses keyed the same way, with the monotonic time they were fetched
+        self._cache: Dict[Tuple[str, date, date], Tuple[float, PropertyDetailsFetchResponse]] = {}
+        # Adaptive limit on concurrent scrapes against airbnb.com, capped at the
+        # browser pool size since scrapes beyond that only wait for a browser
+        self._airbnb_concurrency = AirbnbConcurrency(
+            initial=min(4, AIRBNB_MAX_CONCURRENCY),
+            max_limit=AIRBNB_MAX_CONCURRENCY,
+            max_pause=SCRAPE_MAX_RETRY_DELAY_SECONDS
+        )
+        # Keep-alive HTTP/2 client for the httpx fallback, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
+        # Threads for CPU-bound HTML parsing in the httpx fallback, created on first use
+        self._parse_pool: Optional[ThreadPoolExecutor] = None
         logger.info("PropertyFetcher initialized")
     
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared httpx client, creating it on first use.
+        
+        Reusing one client keeps TCP/TLS connections to Airbnb alive across
+        fetches instead of handshaking on every fallback request.
+        
+        Returns:
+            Shared httpx.AsyncClient
+        """
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                timeout=15.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                headers=_DEFAULT_HEADERS
+            )
+        return self._http
+    
+    def _get_parse_pool(self) -> ThreadPoolExecutor:
+        """
+        Get the HTML parse thread pool, creating it on first use.
+        
+        Returns:
+            Shared ThreadPoolExecutor with HTML_PARSE_WORKERS threads
+        """
+        if self._parse_pool is None:
+            self._parse_pool = ThreadPoolExecutor(
+                max_workers=HTML_PARSE_WORKERS,
+                thread_name_prefix="html-parse"
+            )
+        return self._parse_pool
+    
+    async def aclose(self) -> None:
+        """Close the shared httpx client and parse pool. Called on application shutdown."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False)
+            self._parse_pool = None
+    
+    async def warmup(self) -> None:
+        """
+        Start the browser pool with ready contexts and pages.
+        
+        Called at application startup when BROWSER_WARMUP is enabled, so the
+        first scrapes do not pay the Chromium cold-start cost. Failures are logged and ignored; scraping
+        falls back to lazy launch (or httpx) as usual.
+        """
+        try:
+            await get_browser_pool().start()
+        except ImportError:
+            logger.warning("Playwright not installed, skipping browser warmup")
+        except Exception as e:
+            logger.error(f"Browser warmup failed: {str(e)}")
+    
     def extract_property_id(self, property_url: str) -> str:
         """
         Extract property ID from Airbnb URL.
@@ -38,21 +361,9 @@ class PropertyFetcher:
             Property ID string
             
         Raises:
-            ValueError: If property ID cannot be extracted
+            InvalidUrlError: If property ID cannot be extracted
         """
-        # Match patterns like:
-        # https://www.airbnb.com/rooms/12345678
-        # https://airbnb.com/rooms/12345678?...
-        # https://www.airbnb.com/rooms/12345678/...
-        pattern = r'/rooms/(\d+)'
-        match = re.search(pattern, property_url)
-        
-        if not match:
-            raise ValueError(f"Could not extract property ID from URL: {property_url}")
-        
-        property_id = match.group(1)
-        logger.info(f"Extracted property ID: {property_id} from URL: {property_url}")
-        return property_id
+        return _extract_property_id(property_url)
     
     async def fetch_property_details(
         self,
@@ -74,53 +385,148 @@ class PropertyFetcher:
             property_url: Full Airbnb property URL
             check_in: Check-in date
             check_out: Check-out date
-            
+        
         Returns:
             PropertyDetailsFetchResponse with property details and availability
-            
+        
         Raises:
-            ValueError: If property details cannot be fetched
+            InvalidUrlError: If the URL has no property ID
+            ScrapeTimeoutError: If the property page timed out
+            UpstreamHTTPError: If Airbnb could not be reached or kept throttling
+            PropertyFetchError: If property details cannot be fetched otherwise
         """
+        # Extract property ID
+        property_id = self.extract_property_id(property_url)
+        
         try:
-            # Extract property ID
-            property_id = self.extract_property_id(property_url)
+            # Dates hash directly, so cache hits skip all string formatting
+            key = (property_id, check_in, check_out)
+            
+            # Serve repeated polls of the same property and dates from cache
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < PROPERTY_DETAILS_CACHE_TTL_SECONDS:
+                logger.info("Serving cached details for property %s", property_id)
+                return cached[1]
+            
+            # Join an identical fetch that is already running
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                logger.info("Joining in-flight fetch for property %s", property_id)
+                return await asyncio.shield(inflight)
             
             # Construct URL with dates
             # Format: https://www.airbnb.com/rooms/12345678?check_in=2024-06-01&check_out=2024-06-07
             base_url = f"https://www.airbnb.com/rooms/{property_id}"
-            url_with_dates = f"{base_url}?check_in={check_in.isoformat()}&check_out={check_out.isoformat()}"
-            
-            logger.info(f"Fetching property details from: {url_with_dates}")
-            
-            # Scrape property page
-            # Note: In production, this would use Apify or browser scraping
-            # For now, we'll use mock data for development
-            property_data = await self._scrape_property_page(url_with_dates, property_id)
+            url_with_dates = f"{base_url}?{urlencode({'check_in': check_in.isoformat(), 'check_out': check_out.isoformat()})}"
             
-            # Determine availability
-            is_available = self._check_availability(property_data)
-            current_status = "available" if is_available else "booked"
-            
-            # Build response
-            response = PropertyDetailsFetchResponse(
-                propertyId=property_id,
-                propertyName=property_data.get("name", f"Property {property_id}"),
-                location=property_data.get("location", "Location not available"),
-                price=property_data.get("price", "$0"),
-                imageUrl=property_data.get("image_url"),
-                currentStatus=current_status,
-                isAvailable=is_available,
-                propertyUrl=base_url,
-                checkIn=check_in,
-                checkOut=check_out
-            )
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            try:
+                logger.info("Fetching property details from: %s", url_with_dates)
+                
+                # Scrape property page within the adaptive Airbnb concurrency limit,
+                # backing off and retrying while Airbnb is throttling us
+                for attempt in range(1, SCRAPE_MAX_ATTEMPTS + 1):
+                    try:
+                        async with self._airbnb_concurrency.slot():
+                            started = time.monotonic()
+                            property_data = await self._scrape_property_page(url_with_dates, property_id)
+                            self._airbnb_concurrency.on_success(time.monotonic() - started)
+                        break
+                    except RetryableScrapeError as e:
+                        if attempt == SCRAPE_MAX_ATTEMPTS:
+                            raise
+                        delay = min(
+                            max(e.retry_after, SCRAPE_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1)),
+                            SCRAPE_MAX_RETRY_DELAY_SECONDS
+                        )
+                        logger.warning(
+                            f"Property {property_id} throttled (attempt {attempt}/{SCRAPE_MAX_ATTEMPTS}), "
+                            f"retrying in {delay:.1f}s"
+                        )
+                        await asyncio.sleep(delay)
+                
+                # Determine availability
+                is_available = self._check_availability(property_data)
+                current_status = "available" if is_available else "booked"
+                
+                # Build response (fields come from typed internals, skip validation)
+                response = PropertyDetailsFetchResponse.model_construct(
+                    propertyId=property_id,
+                    propertyName=property_data.get("name", f"Property {property_id}"),
+                    location=property_data.get("location", "Location not available"),
+                    price=property_data.get("price", "$0"),
+                    imageUrl=property_data.get("image_url"),
+                    currentStatus=current_status,
+                    isAvailable=is_available,
+                    propertyUrl=base_url,
+                    checkIn=check_in,
+                    checkOut=check_out
+                )
+                
+                self._store_cached(key, response)
+                future.set_result(response)
+            except Exception as e:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved in case no caller joined
+                raise
+            finally:
+                if not future.done():
+                    # The owning caller was cancelled; fail joiners with a fetch
+                    # error rather than cancelling tasks nobody cancelled
+                    future.set_exception(PropertyFetchError(f"Fetch of property {property_id} was cancelled"))
+                    future.exception()
+                del self._inflight[key]
             
-            logger.info(f"Successfully fetched property {property_id}: {current_status}")
+            logger.info("Successfully fetched property %s: %s", property_id, current_status)
             return response
-            
+        
+        except PropertyFetchError:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching property details: {str(e)}")
-            raise ValueError(f"Failed to fetch property details: {str(e)}")
+            logger.exception("Unexpected error fetching property %s", property_id)
+            raise PropertyFetchError(f"Failed to fetch property details: {e}") from e
+    
+    async def fetch_many(
+        self,
+        items: List[Tuple[str, date, date]]
+    ) -> List[Union[PropertyDetailsFetchResponse, Exception]]:
+        """
+        Fetch details for several properties concurrently.
+        
+        Each fetch still goes through the cache, in-flight coalescing and the
+        adaptive Airbnb concurrency limit, so this only overlaps the waits.
+        
+        Args:
+            items: (property_url, check_in, check_out) tuples
+            
+        Returns:
+            Responses in input order; failed fetches are returned as exceptions
+        """
+        return await asyncio.gather(
+            *[self.fetch_property_details(*item) for item in items],
+            return_exceptions=True
+        )
+    
+    def _store_cached(
+        self,
+        key: Tuple[str, date, date],
+        response: PropertyDetailsFetchResponse
+    ) -> None:
+        """
+        Cache a fetched response, dropping expired entries once the cache grows.
+        
+        Args:
+            key: (property_id, check_in, check_out) cache key
+            response: Response to cache
+        """
+        now = time.monotonic()
+        if len(self._cache) >= 1024:
+            self._cache = {
+                k: v for k, v in self._cache.items()
+                if now - v[0] < PROPERTY_DETAILS_CACHE_TTL_SECONDS
+            }
+        self._cache[key] = (now, response)
     
     async def _scrape_property_page(self, url: str, property_id: str) -> Dict[str, Any]:
         """
@@ -130,128 +536,68 @@ class PropertyFetcher:
         Args:
             url: Property URL with dates
             property_id: Property ID
-            
+        
         Returns:
             Dictionary with property data
         """
         try:
-            # Try browser scraping with shorter timeout and domcontentloaded
-            from app.integrations.browser_scraper import BrowserScraper
+            # Try browser scraping with a fresh context from the shared pool
+            logger.info("Scraping property page with browser: %s", url)
             
-            logger.info(f"Scraping property page with browser: {url}")
-            
-            async with BrowserScraper() as scraper:
-                # Navigate to property page with shorter timeout and less strict wait condition
-                await scraper.page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                await scraper.page.wait_for_timeout(3000)  # Wait for dynamic content
+            async with get_browser_pool().acquire() as context:
+                # Warm contexts from pool start-up already have a page open
+                page = context.pages[0] if context.pages else await context.new_page()
                 
-                # Extract property details
-                property_data = {}
+                # Skip images, stylesheets, fonts and media; only the DOM is read
+                await page.route("**/*", _block_heavy_resources)
                 
-                # Get property name - try multiple selectors
-                try:
-                    # Try h1 first
-                    name_element = await scraper.page.query_selector('h1')
-                    if name_element:
-                        property_data['name'] = (await name_element.inner_text()).strip()
-                    
-                    # If no h1 or empty, try title attribute
-                    if not property_data.get('name'):
-                        title = await scraper.page.title()
-                        if title and 'Airbnb' in title:
-                            # Extract property name from title (usually before " - Airbnb")
-                            property_data['name'] = title.split(' - ')[0].strip()
-                    
-                    # Fallback
-                    if not property_data.get('name'):
-                        property_data['name'] = f"Airbnb Property {property_id}"
-                except Exception as e:
-                    logger.warning(f"Could not extract property name: {e}")
-                    property_data['name'] = f"Airbnb Property {property_id}"
+                # Navigate to property page with shorter timeout and less strict wait condition
+                await page.goto(url, wait_until="domcontentloaded", timeout=15000)
                 
-                # Get location
+                # Wait until the listing title renders instead of sleeping a fixed time
                 try:
-                    # Try multiple location selectors
-                    location_selectors = [
-                        '[data-section-id="LOCATION_DEFAULT"]',
-                        'button[aria-label*="location"]',
-                        'div:has-text("Hosted in")',
-                    ]
-                    for selector in location_selectors:
-                        location_element = await scraper.page.query_selector(selector)
-                        if location_element:
-                            location_text = await location_element.inner_text()
-                            if location_text:
-                                property_data['location'] = location_text.strip()
-                                break
-                    
-                    if not property_data.get('location'):
-                        property_data['location'] = "Location available on Airbnb"
-                except Exception as e:
-                    logger.warning(f"Could not extract location: {e}")
-                    property_data['location'] = "Location available on Airbnb"
+                    await page.wait_for_selector(_TITLE_SELECTOR, timeout=5000)
+                except Exception:
+                    logger.debug("No h1 rendered for property %s within timeout", property_id)
                 
-                # Get price
+                # Give the booking widget a moment to render its button
                 try:
-                    price_selectors = [
-                        '[data-testid="price-item-value"]',
-                        'span:has-text("$")',
-                        'div._1jo4hgw'
-                    ]
-                    for selector in price_selectors:
-                        price_element = await scraper.page.query_selector(selector)
-                        if price_element:
-                            price_text = await price_element.inner_text()
-                            if '$' in price_text:
-                                property_data['price'] = price_text.strip()
-                                break
-                    
-                    if not property_data.get('price'):
-                        property_data['price'] = "See Airbnb for pricing"
-                except Exception as e:
-                    logger.warning(f"Could not extract price: {e}")
-                    property_data['price'] = "See Airbnb for pricing"
+                    await page.wait_for_selector(_RESERVE_BUTTON_SELECTOR, state="attached", timeout=3000)
+                except Exception:
+                    logger.debug("No reserve button rendered for property %s", property_id)
                 
-                # Get image - try to get the main property image
-                try:
-                    image_selectors = [
-                        'img[data-original-uri]',
-                        'picture img',
-                        'img[src*="pictures"]'
-                    ]
-                    for selector in image_selectors:
-                        image_element = await scraper.page.query_selector(selector)
-                        if image_element:
-                            img_src = await image_element.get_attribute('src')
-                            if img_src and 'pictures' in img_src:
-                                property_data['image_url'] = img_src
-                                break
-                except Exception as e:
-                    logger.warning(f"Could not extract image: {e}")
-                    property_data['image_url'] = None
+                # Extract all fields in a single in-page call
+                fields = await page.evaluate(_EXTRACT_JS, _EXTRACT_SELECTORS)
                 
-                # Check availability - look for reserve/book button or unavailable message
-                try:
-                    # Check for unavailable message first
-                    unavailable = await scraper.page.query_selector('text="This place isn\'t available"')
-                    if unavailable:
-                        property_data['available'] = False
-                        property_data['reserve_button'] = False
-                    else:
-                        # Look for reserve button
-                        reserve_button = await scraper.page.query_selector('button:has-text("Reserve"), button:has-text("Book"), button:has-text("Request to book")')
-                        property_data['available'] = reserve_button is not None
-                        property_data['reserve_button'] = reserve_button is not None
-                except Exception as e:
-                    logger.warning(f"Could not check availability: {e}")
-                    property_data['available'] = False
-                    property_data['reserve_button'] = False
+                # Fall back to the page title (usually "<name> - Airbnb") when there is no h1
+                name = fields['name']
+                if not name and fields['title'] and 'Airbnb' in fields['title']:
+                    name = fields['title'].partition(' - ')[0].strip()
                 
-                logger.info(f"Successfully scraped property {property_id}: {property_data.get('name')}, available={property_data.get('available')}")
-                return property_data
+                # An explicit unavailable message overrides the reserve button
+                available = fields['available'] and not fields['unavailable']
+                
+                property_data = {
+                    'name': name or f"Airbnb Property {property_id}",
+                    'location': fields['location'] or "Location available on Airbnb",
+                    'price': fields['price'] or "See Airbnb for pricing",
+                    'image_url': fields['imageUrl'],
+                    'available': available,
+                    'reserve_button': available,
+                }
                 
+                # The embedded listing state is more reliable than DOM heuristics
+                if fields['deferredState']:
+                    property_data.update(_parse_deferred_state(fields['deferredState']))
+                
+                logger.info("Successfully scraped property %s: %s, available=%s", property_id, property_data.get('name'), property_data.get('available'))
+                return property_data
+        
         except ImportError:
             logger.warning("Browser scraper not available, trying httpx fallback")
+        except PlaywrightTimeoutError as e:
+            self._airbnb_concurrency.on_throttle()
+            logger.error(f"Browser scraping timed out: {str(e)}, trying httpx fallback")
         except Exception as e:
             logger.error(f"Browser scraping failed: {str(e)}, trying httpx fallback")
         
@@ -270,9 +616,6 @@ class PropertyFetcher:
         Returns:
             Dictionary with property data extracted from HTML
         """
-        import httpx
-        import json
-        
         property_data = {
             "name": f"Airbnb Property {property_id}",
             "location": "View on Airbnb for details",
@@ -283,158 +626,209 @@ class PropertyFetcher:
         }
         
         try:
-            logger.info(f"Fetching property page with httpx: {url}")
+            logger.info("Fetching property page with httpx: %s", url)
             
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Cache-Control": "no-cache",
-                "Pragma": "no-cache",
-            }
+            response = await self._get_http_client().get(url)
             
-            async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
-                response = await client.get(url, headers=headers)
+            # Rate limited: slow all fetches down and let the caller retry
+            if response.status_code in _RETRYABLE_STATUS_CODES:
+                # Capped so a long reset window does not pause every fetch in
+                # the process, API requests included, for that long
+                retry_after = min(
+                    _retry_after_seconds(response.headers),
+                    SCRAPE_MAX_RETRY_DELAY_SECONDS
+                )
+                self._airbnb_concurrency.on_throttle(retry_after)
+                raise RetryableScrapeError(
+                    f"Airbnb returned status {response.status_code}",
+                    retry_after=retry_after
+                )
+            
+            if response.status_code == 200:
+                logger.debug("httpx response content-encoding: %s", response.headers.get('content-encoding'))
                 
-                if response.status_code == 200:
-                    html = response.text
-                    
-                    # Extract title from <title> tag or og:title meta tag
-                    # Pattern 1: <title>Property Name - Airbnb</title>
-                    title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-                    if title_match:
-                        title = title_match.group(1).strip()
-                        # Clean up title - remove " - Airbnb" suffix
-                        if ' - Airbnb' in title:
-                            title = title.split(' - Airbnb')[0].strip()
-                        elif ' | Airbnb' in title:
-                            title = title.split(' | Airbnb')[0].strip()
-                        if title and title != "Airbnb":
-                            property_data['name'] = title
-                            logger.info(f"Extracted title from HTML: {title}")
-                    
-                    # Pattern 2: og:title meta tag
-                    og_title_match = re.search(r'<meta[^>]*property=["\']og:title["\'][^>]*content=["\']([^"\']+)["\']', html, re.IGNORECASE)
-                    if not og_title_match:
-                        og_title_match = re.search(r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:title["\']', html, re.IGNORECASE)
-                    if og_title_match and property_data['name'] == f"Airbnb Property {property_id}":
-                        og_title = og_title_match.group(1).strip()
-                        if og_title and og_title != "Airbnb":
-                            property_data['name'] = og_title
-                            logger.info(f"Extracted og:title from HTML: {og_title}")
-                    
-                    # Extract image from og:image meta tag
-                    og_image_match = re.search(r'<meta[^>]*property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\']', html, re.IGNORECASE)
-                    if not og_image_match:
-                        og_image_match = re.search(r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\']', html, re.IGNORECASE)
-                    if og_image_match:
-                        image_url = og_image_match.group(1).strip()
-                        if image_url and 'muscache.com' in image_url:
-                            property_data['image_url'] = image_url
-                            logger.info(f"Extracted og:image from HTML: {image_url[:100]}...")
-                    
-                    # Extract location from og:description or page content
-                    og_desc_match = re.search(r'<meta[^>]*property=["\']og:description["\'][^>]*content=["\']([^"\']+)["\']', html, re.IGNORECASE)
-                    if not og_desc_match:
-                        og_desc_match = re.search(r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:description["\']', html, re.IGNORECASE)
-                    if og_desc_match:
-                        description = og_desc_match.group(1).strip()
-                        # Try to extract location from description
-                        # Common patterns: "... in City, State" or "Located in City"
-                        location_patterns = [
-                            r'in\s+([A-Z][^.!?]+(?:,\s*[A-Z][^.!?]+)?)',
-                            r'Located\s+in\s+([^.!?]+)',
-                        ]
-                        for pattern in location_patterns:
-                            loc_match = re.search(pattern, description)
-                            if loc_match:
-                                location = loc_match.group(1).strip()
-                                if len(location) > 3 and len(location) < 100:
-                                    property_data['location'] = location
-                                    logger.info(f"Extracted location from description: {location}")
-                                    break
-                    
-                    # Check availability using multiple signals
-                    # Priority: JSON data > Reserve button > generic text patterns
-                    
-                    html_lower = html.lower()
-                    
-                    # Count JSON availability signals - this is the most reliable
-                    available_true_count = 0
-                    available_false_count = 0
-                    
-                    try:
-                        # Count all "available": true/false occurrences
-                        available_true_count = len(re.findall(r'"available"\s*:\s*true', html, re.IGNORECASE))
-                        available_false_count = len(re.findall(r'"available"\s*:\s*false', html, re.IGNORECASE))
-                        logger.info(f"JSON availability counts: true={available_true_count}, false={available_false_count}")
-                    except Exception as e:
-                        logger.debug(f"Could not count JSON availability: {e}")
-                    
-                    # Check for Reserve/Book button - strong positive signal
-                    has_reserve_button = False
-                    reserve_indicators = ['reserve', 'book now', 'request to book']
-                    for indicator in reserve_indicators:
-                        if indicator in html_lower:
-                            has_reserve_button = True
-                            logger.info(f"Found reserve button indicator: '{indicator}'")
-                            break
-                    
-                    # Check for explicit "this place isn't available" message
-                    # This is a very specific phrase Airbnb uses when dates are blocked
-                    explicit_unavailable = False
-                    explicit_unavailable_phrases = [
-                        "this place isn't available",
-                        "these dates aren't available",
-                        "not available for your dates",
-                        "no longer available",
-                    ]
-                    for phrase in explicit_unavailable_phrases:
-                        if phrase in html_lower:
-                            explicit_unavailable = True
-                            logger.info(f"Found explicit unavailable phrase: '{phrase}'")
-                            break
-                    
-                    # Final availability determination
-                    # Logic:
-                    # 1. If explicit unavailable message found -> unavailable
-                    # 2. If Reserve button found AND more true than false in JSON -> available
-                    # 3. If JSON has significantly more true than false -> available
-                    # 4. Default to available (optimistic)
-                    
-                    if explicit_unavailable:
-                        property_data['available'] = False
-                        property_data['reserve_button'] = False
-                        logger.info(f"Property {property_id} marked as UNAVAILABLE (explicit message found)")
-                    elif has_reserve_button and available_true_count > available_false_count:
-                        property_data['available'] = True
-                        property_data['reserve_button'] = True
-                        logger.info(f"Property {property_id} marked as AVAILABLE (Reserve button + JSON signals)")
-                    elif available_true_count > available_false_count * 2:
-                        # Significantly more true than false
-                        property_data['available'] = True
-                        property_data['reserve_button'] = True
-                        logger.info(f"Property {property_id} marked as AVAILABLE (JSON signals: {available_true_count} true vs {available_false_count} false)")
-                    elif has_reserve_button:
-                        property_data['available'] = True
-                        property_data['reserve_button'] = True
-                        logger.info(f"Property {property_id} marked as AVAILABLE (Reserve button found)")
-                    else:
-                        # Default to available (optimistic approach)
-                        property_data['available'] = True
-                        property_data['reserve_button'] = True
-                        logger.info(f"Property {property_id} defaulting to AVAILABLE (no clear unavailable signals)")
-                    
-                    logger.info(f"httpx scraping successful for property {property_id}: {property_data.get('name')}, available={property_data.get('available')}")
-                else:
-                    logger.warning(f"httpx request returned status {response.status_code}")
-                    
+                # Parsing multi-megabyte pages is CPU-bound, so it runs on a
+                # small thread pool to keep the event loop serving other API requests
+                await asyncio.get_running_loop().run_in_executor(
+                    self._get_parse_pool(),
+                    self._parse_property_html,
+                    response.content,
+                    response.encoding,
+                    property_id,
+                    property_data
+                )
+            else:
+                if response.status_code in _THROTTLE_STATUS_CODES:
+                    self._airbnb_concurrency.on_throttle()
+                logger.warning(f"httpx request returned status {response.status_code}")
+                
+        except RetryableScrapeError:
+            raise
+        except httpx.TimeoutException as e:
+            self._airbnb_concurrency.on_throttle()
+            raise ScrapeTimeoutError(f"Timed out fetching property {property_id}") from e
+        except httpx.HTTPError as e:
+            raise UpstreamHTTPError(f"HTTP error fetching property {property_id}: {e}") from e
         except Exception as e:
             logger.error(f"httpx scraping failed: {str(e)}")
         
         return property_data
     
+    def _parse_property_html(
+        self,
+        content: bytes,
+        encoding: Optional[str],
+        property_id: str,
+        property_data: Dict[str, Any]
+    ) -> None:
+        """
+        Fill property_data from a fetched property page.
+        
+        Runs on the HTML parse thread pool; it only touches its arguments,
+        which the awaiting coroutine does not use until it returns.
+        
+        Args:
+            content: Raw response body
+            encoding: Response text encoding (defaults to UTF-8)
+            property_id: Property ID
+            property_data: Defaults to update in place
+        """
+        html = content.decode(encoding or 'utf-8', errors='replace')
+        
+        # Parse the document once; metadata lookups are tree queries.
+        # Title and og:* tags live in <head>, so the body is not parsed.
+        head = content
+        head_end = content.find(_HEAD_CLOSE)
+        if head_end != -1:
+            head = content[:head_end + len(_HEAD_CLOSE)]
+        tree = LexborHTMLParser(head)
+        
+        # Extract title from <title> tag or og:title meta tag
+        # Pattern 1: <title>Property Name - Airbnb</title>
+        title_node = tree.css_first('title')
+        if title_node:
+            title = title_node.text().strip()
+            # Clean up title - remove " - Airbnb" suffix
+            if ' - Airbnb' in title:
+                title = title.partition(' - Airbnb')[0].strip()
+            elif ' | Airbnb' in title:
+                title = title.partition(' | Airbnb')[0].strip()
+            if title and title != "Airbnb":
+                property_data['name'] = title
+                logger.info("Extracted title from HTML: %s", title)
+        
+        # Pattern 2: og:title meta tag
+        og_title = _og_content(tree, 'title')
+        if og_title and property_data['name'] == f"Airbnb Property {property_id}":
+            og_title = og_title.strip()
+            if og_title and og_title != "Airbnb":
+                property_data['name'] = og_title
+                logger.info("Extracted og:title from HTML: %s", og_title)
+        
+        # Extract image from og:image meta tag
+        image_url = _og_content(tree, 'image')
+        if image_url:
+            image_url = image_url.strip()
+            if image_url and 'muscache.com' in image_url:
+                property_data['image_url'] = image_url
+                logger.info("Extracted og:image from HTML: %s...", image_url[:100])
+        
+        # Extract location from og:description or page content
+        description = _og_content(tree, 'description')
+        if description:
+            description = description.strip()
+            # Try to extract location from description
+            # Common patterns: "... in City, State" or "Located in City"
+            for pattern in _LOCATION_RES:
+                loc_match = pattern.search(description)
+                if loc_match:
+                    location = loc_match.group(1).strip()
+                    if len(location) > 3 and len(location) < 100:
+                        property_data['location'] = location
+                        logger.info("Extracted location from description: %s", location)
+                        break
+        
+        # Prefer the embedded listing state over the meta tags when present
+        state_match = _DEFERRED_STATE_RE.search(html)
+        if state_match:
+            state_fields = _parse_deferred_state(state_match.group(1))
+            if state_fields:
+                property_data.update(state_fields)
+                logger.info("Extracted %s from embedded listing state", ', '.join(state_fields))
+        
+        # Check availability using multiple signals
+        # Priority: JSON data > Reserve button > generic text patterns
+        
+        html_lower = html.lower()
+        
+        # Count JSON availability signals - this is the most reliable
+        available_true_count = 0
+        available_false_count = 0
+        
+        try:
+            # Count all "available": true/false occurrences
+            available_true_count = len(_AVAILABLE_TRUE_RE.findall(html))
+            available_false_count = len(_AVAILABLE_FALSE_RE.findall(html))
+            logger.info("JSON availability counts: true=%s, false=%s", available_true_count, available_false_count)
+        except Exception as e:
+            logger.debug("Could not count JSON availability: %s", e)
+        
+        # Check for Reserve/Book button - strong positive signal
+        has_reserve_button = False
+        reserve_indicators = ['reserve', 'book now', 'request to book']
+        for indicator in reserve_indicators:
+            if indicator in html_lower:
+                has_reserve_button = True
+                logger.info("Found reserve button indicator: '%s'", indicator)
+                break
+        
+        # Check for explicit "this place isn't available" message
+        # This is a very specific phrase Airbnb uses when dates are blocked
+        explicit_unavailable = False
+        explicit_unavailable_phrases = [
+            "this place isn't available",
+            "these dates aren't available",
+            "not available for your dates",
+            "no longer available",
+        ]
+        for phrase in explicit_unavailable_phrases:
+            if phrase in html_lower:
+                explicit_unavailable = True
+                logger.info("Found explicit unavailable phrase: '%s'", phrase)
+                break
+        
+        # Final availability determination
+        # Logic:
+        # 1. If explicit unavailable message found -> unavailable
+        # 2. If Reserve button found AND more true than false in JSON -> available
+        # 3. If JSON has significantly more true than false -> available
+        # 4. Default to available (optimistic)
+        
+        if explicit_unavailable:
+            property_data['available'] = False
+            property_data['reserve_button'] = False
+            logger.info("Property %s marked as UNAVAILABLE (explicit message found)", property_id)
+        elif has_reserve_button and available_true_count > available_false_count:
+            property_data['available'] = True
+            property_data['reserve_button'] = True
+            logger.info("Property %s marked as AVAILABLE (Reserve button + JSON signals)", property_id)
+        elif available_true_count > available_false_count * 2:
+            # Significantly more true than false
+            property_data['available'] = True
+            property_data['reserve_button'] = True
+            logger.info("Property %s marked as AVAILABLE (JSON signals: %s true vs %s false)", property_id, available_true_count, available_false_count)
+        elif has_reserve_button:
+            property_data['available'] = True
+            property_data['reserve_button'] = True
+            logger.info("Property %s marked as AVAILABLE (Reserve button found)", property_id)
+        else:
+            # Default to available (optimistic approach)
+            property_data['available'] = True
+            property_data['reserve_button'] = True
+            logger.info("Property %s defaulting to AVAILABLE (no clear unavailable signals)", property_id)
+        
+        logger.info("httpx scraping successful for property %s: %s, available=%s", property_id, property_data.get('name'), property_data.get('available'))
+    
     def _check_availability(self, property_data: Dict[str, Any]) -> bool:
         """
         Check if property is available based on scraped data.
@@ -458,15 +852,18 @@ class PropertyFetcher:
         # Property is available if it has a reserve button and price
         is_available = has_reserve_button and is_marked_available and has_price
         
-        logger.debug(f"Availability check: reserve_button={has_reserve_button}, "
-                    f"available={is_marked_available}, has_price={has_price}, "
-                    f"result={is_available}")
+        logger.debug("Availability check: reserve_button=%s, available=%s, has_price=%s, result=%s",
+                     has_reserve_button, is_marked_available, has_price, is_available)
         
         return is_available
     
-    async def validate_property_url(self, property_url: str) -> bool:
+    @staticmethod
+    def validate_property_url(property_url: str) -> bool:
         """
-        Validate that a property URL is valid and accessible.
+        Validate that a property URL has an Airbnb room ID.
+        
+        Pure format check, so it is synchronous; fetch_property_details
+        parses the ID through the cached _extract_property_id.
         
         Args:
             property_url: Property URL to validate
@@ -474,14 +871,17 @@ class PropertyFetcher:
         Returns:
             True if valid, False otherwise
         """
-        try:
-            # Try to extract property ID
-            property_id = self.extract_property_id(property_url)
-            
-            # In production, could also check if property exists
-            # For now, just validate format
-            return len(property_id) > 0
-            
-        except Exception as e:
-            logger.warning(f"Invalid property URL: {property_url}, error: {str(e)}")
-            return False
\ No newline at end of file
+        return _ROOM_ID_RE.search(property_url) is not None
+
+
+def get_property_fetcher() -> PropertyFetcher:
+    """
+    Get the shared PropertyFetcher instance, creating it on first use.
+    
+    Returns:
+        PropertyFetcher shared across requests
+    """
+    global _property_fetcher
+    if _property_fetcher is None:
+        _property_fetcher = PropertyFetcher(ApifyClient())
+    return _property_fetcher
@@ -8,9 +8,13 @@ This service is the "worker" that processes a specific Watch by:
 3. Sending notifications on matches
 4. Updating watch status
 """
+import asyncio
+import hashlib
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -20,10 +24,127 @@ from app.models.property import PropertyResult
 from app.services.availability_checker import AvailabilityChecker
 from app.services.notification.manager import NotificationManager
 from app.models.notification import NotificationPreferences, NotificationType
-from app.core.constants import NOTIFICATION_COOLDOWN_HOURS
+from app.core.constants import (
+    NOTIFICATION_COOLDOWN_HOURS,
+    SCAN_LOG_BATCH_SIZE,
+    SCAN_LOG_FLUSH_INTERVAL_SECONDS,
+    SCAN_CPU_WORKERS,
+    USER_CACHE_TTL_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
+# Availability notification templates, formatted with the matched watch.
+# str(date) is its ISO format, so dates render without isoformat() calls.
+NOTIFICATION_SUBJECT_TEMPLATE = "🎉 Property Available: {watch.propertyName}"
+NOTIFICATION_MESSAGE_TEMPLATE = """🎉 Good news! The property you're watching is now available!
+
+Property: {watch.propertyName}
+Location: {watch.location}
+Dates: {watch.checkInDate} to {watch.checkOutDate}
+Guests: {watch.guests}
+Price: {watch.price}
+
+View property: {watch.propertyUrl}
+
+Book now before it's gone!
+"""
+
+
+def _build_scan_log_doc(
+    watch_id: str,
+    status: ScanStatus,
+    result: Optional[ScanResult],
+    check_in: datetime,
+    check_out: datetime,
+    response_time_ms: int,
+    error_message: Optional[str],
+    created_at: datetime
+) -> Dict[str, Any]:
+    """
+    Validate a scan log and dump it to the document inserted into scan_logs.
+    
+    Runs on the scan processor's CPU pool. Unset optional fields are left
+    out of the document, and the dates go back in as datetimes since BSON
+    cannot encode datetime.date.
+    """
+    scan_log = ScanLogCreate(
+        watch_id=watch_id,
+        status=status,
+        result=result,
+        check_in=check_in,
+        check_out=check_out,
+        response_time_ms=response_time_ms,
+        error_message=error_message
+    )
+    log_dict = scan_log.model_dump(exclude_none=True)
+    log_dict["check_in"] = check_in
+    log_dict["check_out"] = check_out
+    log_dict["created_at"] = created_at
+    return log_dict
+
+
+class _ExpiringCache:
+    """
+    In-memory map whose entries expire at a given timestamp.
+    
+    Expired entries are dropped when read, and the whole map is swept each
+    time it doubles in size since the last sweep, so keys that are never
+    read again (deleted watches, inactive users) do not accumulate.
+    """
+    
+    def __init__(self, min_sweep_size: int = 256):
+        """
+        Initialize the cache.
+        
+        Args:
+            min_sweep_size: Smallest size at which a full sweep runs
+        """
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._min_sweep_size = min_sweep_size
+        self._sweep_at = min_sweep_size
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str, now: float) -> Optional[Any]:
+        """
+        Get a live entry's value.
+        
+        Args:
+            key: Entry key
+            now: Current time on the same clock as the expiry timestamps
+            
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            return None
+        return entry[1]
+    
+    def set(self, key: str, value: Any, expires_at: float, now: float) -> None:
+        """
+        Store a value until expires_at, sweeping expired entries when due.
+        
+        Args:
+            key: Entry key
+            value: Value to store
+            expires_at: Time at which the entry expires
+            now: Current time on the same clock as expires_at
+        """
+        self._entries[key] = (expires_at, value)
+        if len(self._entries) >= self._sweep_at:
+            self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+            self._sweep_at = max(self._min_sweep_size, 2 * len(self._entries))
+    
+    def pop(self, key: str) -> None:
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+
 
 class ScanProcessor:
     """
@@ -40,7 +161,8 @@ class ScanProcessor:
         self,
         availability_checker: AvailabilityChecker,
         notification_manager: NotificationManager,
-        db: AsyncIOMotorDatabase
+        db: AsyncIOMotorDatabase,
+        redis_client: Optional[Any] = None
     ):
         """
         Initialize the ScanProcessor.
@@ -49,28 +171,73 @@ class ScanProcessor:
             availability_checker: Service to check property availability
             notification_manager: Service to send notifications
             db: MongoDB database instance
+            redis_client: Optional redis.asyncio client for notification dedup
+                across processes; an in-process lock table is used without it
         """
         self.availability_checker = availability_checker
         self.notification_manager = notification_manager
         self.db = db
+        self.redis = redis_client
+        # Scan logs waiting to be written in one insert_many
+        self._log_buffer: List[Dict[str, Any]] = []
+        self._log_lock = asyncio.Lock()
+        self._last_flush = time.monotonic()
+        # Watch ID -> cooldown marker, expiring (epoch seconds) when the next
+        # notification is allowed
+        self._cooldown_cache = _ExpiringCache()
+        # User ID -> user document, expiring USER_CACHE_TTL_SECONDS (monotonic) after fetch
+        self._user_cache = _ExpiringCache()
+        # Notification lock keys held without Redis, expiring (epoch seconds)
+        # at the end of the cooldown
+        self._notification_locks = _ExpiringCache()
+        # Threads for notification formatting and scan log serialization, so
+        # that work never stalls I/O callbacks on the event loop. Database and
+        # notification sends stay on the loop. Created on first use.
+        self._cpu_pool: Optional[ThreadPoolExecutor] = None
         logger.info("ScanProcessor initialized")
     
-    async def process_watch(self, watch: WatchInDB) -> None:
+    def _get_cpu_pool(self) -> ThreadPoolExecutor:
+        """
+        Get the CPU work thread pool, creating it on first use.
+        
+        Returns:
+            Shared ThreadPoolExecutor with SCAN_CPU_WORKERS threads
+        """
+        if self._cpu_pool is None:
+            self._cpu_pool = ThreadPoolExecutor(
+                max_workers=SCAN_CPU_WORKERS,
+                thread_name_prefix="scan-cpu"
+            )
+        return self._cpu_pool
+    
+    def close(self) -> None:
+        """Shut down the CPU work thread pool. Called on application shutdown."""
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=False)
+            self._cpu_pool = None
+    
+    async def process_watch(self, watch: WatchInDB) -> Dict[str, Any]:
         """
         Process a single watch by checking availability and handling notifications.
         
         Args:
             watch: The watch to process
             
+        Returns:
+            Fields to $set on the watch document (status and timestamps). The
+            caller writes them, batched with its own updates.
+            
         Workflow:
             1. Check property availability
             2. Log the scan result
             3. Send notification if property is available
-            4. Update watch status and timestamps
+            4. Build watch status and timestamp update
         """
         logger.info(f"Processing watch {watch.id} for property {watch.propertyId}")
         
-        start_time = datetime.now(timezone.utc)
+        # One wall-clock timestamp for every record written by this scan
+        now = datetime.now(timezone.utc)
+        started = time.monotonic()
         scan_status = ScanStatus.SUCCESS
         scan_result = None
         error_message = None
@@ -80,141 +247,201 @@ class ScanProcessor:
             scan_result, matching_property = await self.availability_checker.check_availability(watch)
             
             # Calculate response time
-            end_time = datetime.now(timezone.utc)
-            response_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            response_time_ms = int((time.monotonic() - started) * 1000)
             
             logger.info(
                 f"Availability check completed for watch {watch.id}: "
                 f"result={scan_result.value}, response_time={response_time_ms}ms"
             )
             
-            # Step 2: Log the scan result
-            # Convert date to datetime for MongoDB
-            from datetime import date as date_type
-            check_in_dt = datetime.combine(watch.checkInDate, datetime.min.time()) if isinstance(watch.checkInDate, date_type) and not isinstance(watch.checkInDate, datetime) else watch.checkInDate
-            check_out_dt = datetime.combine(watch.checkOutDate, datetime.min.time()) if isinstance(watch.checkOutDate, date_type) and not isinstance(watch.checkOutDate, datetime) else watch.checkOutDate
-            
-            await self._create_scan_log(
-                watch_id=watch.id,
-                status=scan_status,
-                result=scan_result,
-                response_time_ms=response_time_ms,
-                error_message=None,
-                check_in=check_in_dt,
-                check_out=check_out_dt
+            # Steps 2-3: Log the result and notify on a match. Shielded so a
+            # scan timeout in the scheduler cannot cancel a notification
+            # half-sent or drop its scan log.
+            await asyncio.shield(
+                self._record_scan_result(
+                    watch, scan_status, scan_result, matching_property,
+                    response_time_ms, now
+                )
             )
             
-            # Step 3: Handle match - send notification if available
-            if scan_result == ScanResult.AVAILABLE:
-                await self._handle_availability_match(watch, matching_property)
-            
-            # Step 4: Update watch status
-            await self._update_watch_after_scan(
+            # Step 4: Build watch status update
+            return self._build_watch_update(
                 watch_id=watch.id,
                 status="active",
-                error_message=None
+                error_message=None,
+                now=now
             )
             
         except Exception as e:
             # Handle errors during scan
             logger.error(f"Error processing watch {watch.id}: {str(e)}", exc_info=True)
             
-            end_time = datetime.now(timezone.utc)
-            response_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            response_time_ms = int((time.monotonic() - started) * 1000)
             
             scan_status = ScanStatus.ERROR
             error_message = str(e)
             
             # Log the failed scan
-            # Convert date to datetime for MongoDB
-            from datetime import date as date_type
-            check_in_dt = datetime.combine(watch.checkInDate, datetime.min.time()) if isinstance(watch.checkInDate, date_type) and not isinstance(watch.checkInDate, datetime) else watch.checkInDate
-            check_out_dt = datetime.combine(watch.checkOutDate, datetime.min.time()) if isinstance(watch.checkOutDate, date_type) and not isinstance(watch.checkOutDate, datetime) else watch.checkOutDate
-            
-            await self._create_scan_log(
-                watch_id=watch.id,
-                status=scan_status,
-                result=None,
-                response_time_ms=response_time_ms,
-                error_message=error_message,
-                check_in=check_in_dt,
-                check_out=check_out_dt
+            await asyncio.shield(
+                self._create_scan_log(
+                    watch=watch,
+                    status=scan_status,
+                    result=None,
+                    response_time_ms=response_time_ms,
+                    error_message=error_message,
+                    now=now
+                )
             )
             
             # Update watch to error status
-            await self._update_watch_after_scan(
+            return self._build_watch_update(
                 watch_id=watch.id,
                 status="error",
-                error_message=error_message
+                error_message=error_message,
+                now=now
             )
     
+    async def _record_scan_result(
+        self,
+        watch: WatchInDB,
+        scan_status: ScanStatus,
+        scan_result: ScanResult,
+        matching_property: Optional[PropertyResult],
+        response_time_ms: int,
+        now: datetime
+    ) -> None:
+        """
+        Log a completed availability check and notify the user on a match.
+        
+        Args:
+            watch: The watch that was scanned
+            scan_status: Status of the scan operation
+            scan_result: Result of the availability check
+            matching_property: Property that matched the watch, if any
+            response_time_ms: Response time in milliseconds
+            now: Scan timestamp shared by the log and notification records
+        """
+        await self._create_scan_log(
+            watch=watch,
+            status=scan_status,
+            result=scan_result,
+            response_time_ms=response_time_ms,
+            error_message=None,
+            now=now
+        )
+        
+        if scan_result == ScanResult.AVAILABLE:
+            await self._handle_availability_match(watch, matching_property, now)
+    
+    async def log_failed_scan(
+        self,
+        watch: WatchInDB,
+        error_message: str,
+        response_time_ms: int,
+        now: Optional[datetime] = None
+    ) -> None:
+        """
+        Buffer an ERROR scan log for a scan that failed outside process_watch,
+        such as one the scheduler cancelled for running past its timeout.
+        
+        Args:
+            watch: The watch being scanned
+            error_message: Why the scan failed
+            response_time_ms: Time spent on the scan in milliseconds
+            now: Scan timestamp used as created_at (defaults to current time)
+        """
+        await self._create_scan_log(
+            watch=watch,
+            status=ScanStatus.ERROR,
+            result=None,
+            response_time_ms=response_time_ms,
+            error_message=error_message,
+            now=now
+        )
+    
     async def _create_scan_log(
         self,
-        watch_id: str,
+        watch: WatchInDB,
         status: ScanStatus,
         result: Optional[ScanResult],
         response_time_ms: int,
         error_message: Optional[str],
-        check_in = None,
-        check_out = None
+        now: Optional[datetime] = None
     ) -> None:
         """
-        Create a scan log entry in the database.
+        Buffer a scan log entry for the database.
+        
+        Entries are written in batches by flush_scan_logs once the buffer
+        reaches SCAN_LOG_BATCH_SIZE or SCAN_LOG_FLUSH_INTERVAL_SECONDS passes.
         
         Args:
-            watch_id: ID of the watch being scanned
+            watch: The watch being scanned
             status: Status of the scan operation
             result: Result of the availability check (if successful)
             response_time_ms: Response time in milliseconds
             error_message: Error message if scan failed
-            check_in: Check-in date (optional, will fetch from DB if not provided)
-            check_out: Check-out date (optional, will fetch from DB if not provided)
+            now: Scan timestamp used as created_at (defaults to current time)
         """
+        watch_id = watch.id
         try:
-            # If dates not provided, fetch from database
-            if check_in is None or check_out is None:
-                from bson import ObjectId
-                
-                # Convert string ID to ObjectId for MongoDB query
-                watch_doc = await self.db.watches.find_one({"_id": ObjectId(watch_id)})
-                if not watch_doc:
-                    logger.error(f"Watch {watch_id} not found when creating scan log")
-                    return
-                
-                check_in = watch_doc["checkInDate"]
-                check_out = watch_doc["checkOutDate"]
-            
-            # Convert date objects to datetime for MongoDB compatibility
-            from datetime import date as date_type
-            if isinstance(check_in, date_type) and not isinstance(check_in, datetime):
-                check_in = datetime.combine(check_in, datetime.min.time())
-            if isinstance(check_out, date_type) and not isinstance(check_out, datetime):
-                check_out = datetime.combine(check_out, datetime.min.time())
-            
-            scan_log = ScanLogCreate(
-                watch_id=watch_id,
-                status=status,
-                result=result,
-                check_in=check_in,
-                check_out=check_out,
-                response_time_ms=response_time_ms,
-                error_message=error_message
+            # Validation and model_dump run on the CPU pool; BSON encoding
+            # happens later in insert_many, on Motor's own worker threads.
+            # The midnight datetimes cached on the watch are resolved here so
+            # its cached properties are only ever filled in on the loop.
+            log_dict = await asyncio.get_running_loop().run_in_executor(
+                self._get_cpu_pool(),
+                _build_scan_log_doc,
+                watch_id,
+                status,
+                result,
+                watch.checkInDateDT,
+                watch.checkOutDateDT,
+                response_time_ms,
+                error_message,
+                now or datetime.now(timezone.utc)
             )
             
-            # Insert into scan_logs collection
-            log_dict = scan_log.model_dump()
-            log_dict["created_at"] = datetime.now(timezone.utc)
+            # Buffer for a batched insert into scan_logs collection
+            self._log_buffer.append(log_dict)
+            logger.info(f"Buffered scan log for watch {watch_id}")
             
-            await self.db.scan_logs.insert_one(log_dict)
-            logger.info(f"Created scan log for watch {watch_id}")
+            if (
+                len(self._log_buffer) >= SCAN_LOG_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= SCAN_LOG_FLUSH_INTERVAL_SECONDS
+            ):
+                await self.flush_scan_logs()
             
         except Exception as e:
             logger.error(f"Failed to create scan log for watch {watch_id}: {str(e)}", exc_info=True)
     
+    async def flush_scan_logs(self) -> None:
+        """
+        Write all buffered scan logs with a single unordered insert_many.
+        
+        Safe to call concurrently; the buffer is swapped out under a lock so
+        each entry is written once.
+        """
+        async with self._log_lock:
+            batch, self._log_buffer = self._log_buffer, []
+            self._last_flush = time.monotonic()
+            if not batch:
+                return
+            
+            try:
+                await self.db.scan_logs.insert_many(
+                    batch,
+                    ordered=False,
+                    bypass_document_validation=True
+                )
+                logger.info(f"Flushed {len(batch)} scan logs")
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} scan logs: {str(e)}", exc_info=True)
+    
     async def _handle_availability_match(
         self,
         watch: WatchInDB,
-        matching_property: Optional[PropertyResult]
+        matching_property: Optional[PropertyResult],
+        now: datetime
     ) -> None:
         """
         Handle a successful availability match by sending notifications.
@@ -222,86 +449,189 @@ class ScanProcessor:
         Args:
             watch: The watch that matched
             matching_property: The matching property data
+            now: Scan timestamp, recorded as lastNotificationSent
         """
         logger.info(f"Property available for watch {watch.id}, preparing notification")
         
         try:
             # Check if we should send notification (duplicate prevention)
-            if not await self._should_send_notification(watch):
+            if not self._should_send_notification(watch, now):
                 logger.info(f"Skipping notification for watch {watch.id} (duplicate prevention)")
                 return
             
-            # Fetch user to get notification preferences and contact info
-            user_doc = await self.db.users.find_one({"_id": watch.userId})
-            if not user_doc:
-                logger.error(f"User {watch.userId} not found for watch {watch.id}")
+            # Atomically claim the notification so concurrent scans cannot double-send
+            lock_key = self._notification_lock_key(watch)
+            if not await self._acquire_notification_lock(lock_key, now):
+                logger.info(f"Skipping notification for watch {watch.id} (already claimed)")
                 return
             
-            # Construct notification message
-            message = self._construct_notification_message(watch, matching_property)
-            subject = f"🎉 Property Available: {watch.propertyName}"
-            
-            # Get user notification preferences
-            user_prefs = NotificationPreferences(
-                emailEnabled=user_doc.get("notificationPreferences", {}).get("emailEnabled", True),
-                smsEnabled=user_doc.get("notificationPreferences", {}).get("smsEnabled", False)
-            )
-            
-            # Send multi-channel notification
-            results = self.notification_manager.send_multi_channel(
-                user_prefs=user_prefs,
-                email=user_doc.get("email"),
-                phone=user_doc.get("phone"),
-                message=message,
-                subject=subject
-            )
+            # Keep the lock for the cooldown only once a notification went out;
+            # on any other exit let a later scan retry
+            sent = False
+            try:
+                # Fetch user to get notification preferences and contact info
+                user_doc = await self._get_user(watch.userId)
+                if not user_doc:
+                    logger.error(f"User {watch.userId} not found for watch {watch.id}")
+                    return
+                
+                # Format the message and subject on the CPU pool
+                message, subject = await asyncio.get_running_loop().run_in_executor(
+                    self._get_cpu_pool(),
+                    self._build_notification_text,
+                    watch,
+                    matching_property
+                )
+                
+                # Get user notification preferences
+                user_prefs = NotificationPreferences(
+                    emailEnabled=user_doc.get("notificationPreferences", {}).get("emailEnabled", True),
+                    smsEnabled=user_doc.get("notificationPreferences", {}).get("smsEnabled", False)
+                )
+                
+                # Send multi-channel notification
+                results = self.notification_manager.send_multi_channel(
+                    user_prefs=user_prefs,
+                    email=user_doc.get("email"),
+                    phone=user_doc.get("phone"),
+                    message=message,
+                    subject=subject
+                )
+                sent = True
+            finally:
+                if not sent:
+                    await self._release_notification_lock(lock_key)
             
             logger.info(f"Notification sent for watch {watch.id}: {results}")
             
-            from bson import ObjectId
-            
             # Update last_notification_sent timestamp
             await self.db.watches.update_one(
-                {"_id": ObjectId(watch.id)},
+                {"_id": watch.object_id},
                 {
                     "$set": {
-                        "lastNotificationSent": datetime.now(timezone.utc),
-                        "updatedAt": datetime.now(timezone.utc)
+                        "lastNotificationSent": now,
+                        "updatedAt": now
                     }
                 }
             )
+            self._cooldown_cache.set(
+                watch.id, True, now.timestamp() + NOTIFICATION_COOLDOWN_HOURS * 3600, now.timestamp()
+            )
             
         except Exception as e:
             logger.error(f"Failed to send notification for watch {watch.id}: {str(e)}", exc_info=True)
     
-    async def _should_send_notification(self, watch: WatchInDB) -> bool:
+    def _notification_lock_key(self, watch: WatchInDB) -> str:
+        """
+        Build the dedup key for a notification.
+        
+        Keyed on user, property and dates rather than watch ID, so duplicate
+        watches for the same stay alert only once.
+        
+        Args:
+            watch: The watch that matched
+            
+        Returns:
+            Redis key for the notification lock
+        """
+        raw = f"{watch.userId}:{watch.propertyId}:{watch.checkInDate}:{watch.checkOutDate}"
+        return f"notif:{hashlib.md5(raw.encode()).hexdigest()}"
+    
+    async def _acquire_notification_lock(self, key: str, now: datetime) -> bool:
+        """
+        Claim a notification for the cooldown period.
+        
+        Uses Redis SET NX EX when configured; otherwise an in-process table,
+        which is atomic because no await happens between check and set.
+        
+        Args:
+            key: Notification lock key
+            now: Scan timestamp
+            
+        Returns:
+            True if this caller claimed the notification, False if already claimed
+        """
+        ttl_seconds = NOTIFICATION_COOLDOWN_HOURS * 3600
+        
+        if self.redis is not None:
+            try:
+                return bool(await self.redis.set(key, "1", nx=True, ex=ttl_seconds))
+            except Exception as e:
+                logger.warning(f"Redis notification lock failed, using local lock: {str(e)}")
+        
+        if self._notification_locks.get(key, now.timestamp()) is not None:
+            return False
+        self._notification_locks.set(key, True, now.timestamp() + ttl_seconds, now.timestamp())
+        return True
+    
+    async def _release_notification_lock(self, key: str) -> None:
+        """
+        Release a notification lock when no notification was sent.
+        
+        Args:
+            key: Notification lock key
+        """
+        self._notification_locks.pop(key)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(key)
+            except Exception as e:
+                logger.warning(f"Failed to release notification lock {key}: {str(e)}")
+    
+    async def _get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a user document, served from a short-lived in-memory cache.
+        
+        Args:
+            user_id: ID of the user to fetch
+            
+        Returns:
+            User document, or None if the user does not exist
+        """
+        cached = self._user_cache.get(user_id, time.monotonic())
+        if cached is not None:
+            return cached
+        
+        user_doc = await self.db.users.find_one({"_id": user_id})
+        if user_doc:
+            now = time.monotonic()
+            self._user_cache.set(user_id, user_doc, now + USER_CACHE_TTL_SECONDS, now)
+        return user_doc
+    
+    def _should_send_notification(self, watch: WatchInDB, now: datetime) -> bool:
         """
         Determine if a notification should be sent for this watch.
         
         Implements duplicate alert prevention by checking when the last
-        notification was sent.
+        notification was sent, using the watch loaded by the scheduler and
+        any more recent send cached in memory.
         
         Args:
             watch: The watch to check
+            now: Scan timestamp to measure the cooldown against
             
         Returns:
             True if notification should be sent, False otherwise
         """
-        from bson import ObjectId
-        
-        # Fetch latest watch data from database
-        watch_doc = await self.db.watches.find_one({"_id": ObjectId(watch.id)})
-        if not watch_doc:
+        if self._cooldown_cache.get(watch.id, now.timestamp()) is not None:
+            logger.info(f"Skipping notification for watch {watch.id}: cooldown active (cached)")
             return False
         
-        last_notification = watch_doc.get("lastNotificationSent")
+        last_notification = watch.lastNotificationSent
         
         # If never notified, send notification
         if not last_notification:
             return True
         
+        # MongoDB returns naive UTC datetimes unless tz_aware is set
+        if last_notification.tzinfo is None:
+            last_notification = last_notification.replace(tzinfo=timezone.utc)
+        cooldown_until = last_notification.timestamp() + NOTIFICATION_COOLDOWN_HOURS * 3600
+        if cooldown_until > now.timestamp():
+            self._cooldown_cache.set(watch.id, True, cooldown_until, now.timestamp())
+        
         # Don't send duplicate notifications within configured cooldown period
-        time_since_last = datetime.now(timezone.utc) - last_notification
+        time_since_last = now - last_notification
         if time_since_last < timedelta(hours=NOTIFICATION_COOLDOWN_HOURS):
             logger.info(
                 f"Skipping notification for watch {watch.id}: "
@@ -312,6 +642,25 @@ class ScanProcessor:
         
         return True
     
+    def _build_notification_text(
+        self,
+        watch: WatchInDB,
+        matching_property: Optional[PropertyResult]
+    ) -> Tuple[str, str]:
+        """
+        Build the notification message and subject. Runs on the CPU pool.
+        
+        Args:
+            watch: The watch that matched
+            matching_property: The matching property data
+            
+        Returns:
+            (message, subject) tuple
+        """
+        message = self._construct_notification_message(watch, matching_property)
+        subject = NOTIFICATION_SUBJECT_TEMPLATE.format(watch=watch)
+        return message, subject
+    
     def _construct_notification_message(
         self,
         watch: WatchInDB,
@@ -327,52 +676,34 @@ class ScanProcessor:
         Returns:
             Formatted notification message
         """
-        message = f"""🎉 Good news! The property you're watching is now available!
-
-Property: {watch.propertyName}
-Location: {watch.location}
-Dates: {watch.checkInDate.isoformat()} to {watch.checkOutDate.isoformat()}
-Guests: {watch.guests}
-Price: {watch.price}
-
-View property: {watch.propertyUrl}
-
-Book now before it's gone!
-"""
-        return message
+        return NOTIFICATION_MESSAGE_TEMPLATE.format(watch=watch)
     
-    async def _update_watch_after_scan(
+    def _build_watch_update(
         self,
         watch_id: str,
         status: str,
-        error_message: Optional[str]
-    ) -> None:
+        error_message: Optional[str],
+        now: datetime
+    ) -> Dict[str, Any]:
         """
-        Update watch status and timestamps after a scan.
+        Build the watch status and timestamp update for after a scan.
         
         Args:
-            watch_id: ID of the watch to update
+            watch_id: ID of the watch being updated
             status: New status for the watch
             error_message: Error message if scan failed
-        """
-        try:
-            update_data = {
-                "lastScannedAt": datetime.now(timezone.utc),
-                "updatedAt": datetime.now(timezone.utc),
-                "status": status
-            }
+            now: Scan timestamp, recorded as lastScannedAt
             
-            from bson import ObjectId
-            
-            if error_message:
-                update_data["errorMessage"] = error_message
-            
-            await self.db.watches.update_one(
-                {"_id": ObjectId(watch_id)},
-                {"$set": update_data}
-            )
-            
-            logger.info(f"Updated watch {watch_id} after scan: status={status}")
-            
-        except Exception as e:
-            logger.error(f"Failed to update watch {watch_id}: {str(e)}", exc_info=True)
\ No newline at end of file
+        Returns:
+            Fields to $set on the watch document
+        """
+        update_data = {
+            "lastScannedAt": now,
+            "updatedAt": now,
+            "status": status,
+            # Cleared on success so a past timeout or error does not linger
+            "errorMessage": error_message
+        }
+        
+        logger.info(f"Prepared update for watch {watch_id} after scan: status={status}")
+        return update_data
@@ -8,14 +8,26 @@ ensures watches are scanned according to their frequency settings.
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
 
 from app.services.scan_processor import ScanProcessor
 from app.models.watch import WatchInDB
+from app.core.config import settings
 from app.core.constants import (
     SCHEDULER_CHECK_INTERVAL_SECONDS,
+    SCHEDULER_FALLBACK_INTERVAL_SECONDS,
+    SCHEDULER_MIN_SLEEP_SECONDS,
+    SCAN_CONCURRENCY,
+    SCAN_LEASE_MARGIN_SECONDS,
+    WATCH_SCAN_TIMEOUT_MARGIN_SECONDS,
+    MAX_POLL_ATTEMPTS,
+    POLL_INTERVAL_SECONDS,
+    SCAN_LOG_FLUSH_INTERVAL_SECONDS,
+    WATCH_UPDATE_BATCH_SIZE,
     DAILY_SCAN_HOUR,
     HOURLY_SCAN_INTERVAL_HOURS,
     SNIPER_SCAN_INTERVAL_MINUTES
@@ -23,6 +35,38 @@ from app.core.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Fields needed to build a WatchInDB for scanning
+_WATCH_FIELDS = (
+    "userId", "propertyId", "propertyName", "propertyUrl", "location",
+    "checkInDate", "checkOutDate", "guests", "price", "frequency",
+    "partialMatch", "status", "lastScannedAt", "nextScanAt",
+    "lastNotificationSent", "expiresAt", "createdAt", "updatedAt"
+)
+_DUE_WATCH_PROJECTION = {field: 1 for field in _WATCH_FIELDS}
+
+# Change stream pipeline: inserted/replaced watches and updates that set
+# nextScanAt, reduced to the new nextScanAt value
+_WATCH_CHANGES_PIPELINE = [
+    {"$match": {"$or": [
+        {"operationType": {"$in": ["insert", "replace"]}},
+        {"operationType": "update", "updateDescription.updatedFields.nextScanAt": {"$exists": True}}
+    ]}},
+    {"$project": {"nextScanAt": {"$ifNull": [
+        "$fullDocument.nextScanAt",
+        "$updateDescription.updatedFields.nextScanAt"
+    ]}}}
+]
+
+# Server error code when change streams are unavailable (standalone mongod)
+_CHANGE_STREAM_UNSUPPORTED = 40573
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes from MongoDB (unless tz_aware is set) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
 
 class SchedulerService:
     """
@@ -30,8 +74,10 @@ class SchedulerService:
     
     This service:
     - Runs in a background asyncio task
-    - Checks every 60 seconds for watches that need scanning
-    - Dispatches due watches to the ScanProcessor
+    - Sleeps until the next watch is due, woken early by a change stream
+      on the watches collection when one is available
+    - Enqueues due watches for a fixed pool of worker tasks
+    - Workers dispatch watches to the ScanProcessor
     - Updates nextScanAt timestamps after processing
     """
     
@@ -51,41 +97,94 @@ class SchedulerService:
         self.db = db
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._workers: List[asyncio.Task] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._change_stream_task: Optional[asyncio.Task] = None
+        # Set by the change stream when a watch becomes due before the loop wakes
+        self._wakeup = asyncio.Event()
+        self._next_wake_at: Optional[datetime] = None
+        self._change_stream_open = False
+        self._queue: Optional[asyncio.Queue] = None
+        # Free worker slots; a watch is only claimed once a worker can start it,
+        # so leases do not run down while claimed watches wait in the queue
+        self._slots = asyncio.Semaphore(SCAN_CONCURRENCY)
+        # Longest a scan may run: the Apify trigger request, the result polling
+        # and a margin for the rest of the scan
+        self._scan_timeout = (
+            settings.APIFY_TIMEOUT
+            + MAX_POLL_ATTEMPTS * POLL_INTERVAL_SECONDS
+            + WATCH_SCAN_TIMEOUT_MARGIN_SECONDS
+        )
+        # IDs of watches queued or being scanned, so slow scans are not re-enqueued
+        self._pending_ids: Set = set()
+        # Post-scan watch updates written together with bulk_write
+        self._watch_updates: List[UpdateOne] = []
+        self._updated_ids: List = []
+        self._update_lock = asyncio.Lock()
+        # nextScanAt expressions built once per frequency and shared by every update
+        self._next_scan_expressions = {
+            frequency: self._next_scan_expression(frequency)
+            for frequency in ("daily", "hourly", "sniper")
+        }
         logger.info("SchedulerService initialized")
     
     def start(self) -> None:
         """
         Start the scheduler background task.
         
-        Sets the running flag and creates an asyncio task for the main loop.
+        Sets the running flag, creates the work queue with SCAN_CONCURRENCY
+        worker tasks, and creates an asyncio task for the main loop.
         """
         if self._running:
             logger.warning("Scheduler is already running")
             return
         
         self._running = True
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(SCAN_CONCURRENCY)
+        self._pending_ids.clear()
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(SCAN_CONCURRENCY)
+        ]
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._change_stream_task = asyncio.create_task(self._watch_changes())
         self._task = asyncio.create_task(self._loop())
-        logger.info("Scheduler started")
+        logger.info(f"Scheduler started with {SCAN_CONCURRENCY} workers")
     
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """
         Stop the scheduler background task.
         
-        Sets the running flag to False, which will cause the loop to exit.
+        Sets the running flag to False, cancels and waits for the main loop,
+        worker, flush and change stream tasks, and writes any buffered watch
+        updates and scan logs.
         """
         if not self._running:
             logger.warning("Scheduler is not running")
             return
         
         self._running = False
+        tasks = [self._task, self._flush_task, self._change_stream_task, *self._workers]
+        tasks = [task for task in tasks if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._flush_task = None
+        self._change_stream_task = None
+        self._workers = []
+        
+        await self._flush_watch_updates()
+        await self.processor.flush_scan_logs()
         logger.info("Scheduler stop requested")
     
     async def _loop(self) -> None:
         """
         Main scheduler loop that runs while _running is True.
         
-        Continuously checks for due watches and processes them, then sleeps
-        for 60 seconds before the next iteration.
+        Continuously checks for due watches and enqueues them, then sleeps
+        until the next watch is due before the next iteration. The change
+        stream cuts the sleep short when a watch becomes due sooner.
         """
         logger.info("Scheduler loop started")
         
@@ -95,121 +194,335 @@ class SchedulerService:
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {str(e)}", exc_info=True)
             
-            # Sleep for configured interval before next check
-            await asyncio.sleep(SCHEDULER_CHECK_INTERVAL_SECONDS)
+            # Sleep until the next watch is due or the change stream wakes us
+            delay = await self._seconds_until_next_due()
+            self._next_wake_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
         
         logger.info("Scheduler loop stopped")
     
-    async def _process_due_watches(self) -> None:
+    async def _seconds_until_next_due(self) -> float:
         """
-        Find and process all watches that are due for scanning.
+        Work out how long to sleep before the next scheduler check.
+        
+        Unleased due watches have just been enqueued, so future nextScanAt
+        values are considered, along with the earliest lease expiry among
+        due watches leased by a scheduler. Lease expiry produces no change
+        event, so without it watches left by a crashed worker would wait
+        for the fallback interval.
         
-        Queries the database for active watches where nextScanAt <= now,
-        processes each watch via the ScanProcessor, and updates the
-        nextScanAt timestamp based on the watch's frequency.
+        Returns:
+            Seconds until the next watch is due or its lease expires, clamped to
+            [SCHEDULER_MIN_SLEEP_SECONDS, SCHEDULER_CHECK_INTERVAL_SECONDS],
+            or to SCHEDULER_FALLBACK_INTERVAL_SECONDS while the change
+            stream is open
         """
+        max_sleep = (
+            SCHEDULER_FALLBACK_INTERVAL_SECONDS if self._change_stream_open
+            else SCHEDULER_CHECK_INTERVAL_SECONDS
+        )
         now = datetime.now(timezone.utc)
-        
         try:
-            # Query for active watches that are due for scanning
-            cursor = self.db.watches.find({
-                "status": "active",
-                "nextScanAt": {"$lte": now}
-            })
-            
-            watches = await cursor.to_list(length=None)
+            next_doc, leased_doc = await asyncio.gather(
+                self.db.watches.find_one(
+                    {"status": "active", "nextScanAt": {"$gt": now}},
+                    {"nextScanAt": 1},
+                    sort=[("nextScanAt", 1)]
+                ),
+                self.db.watches.find_one(
+                    {
+                        "status": "active",
+                        "nextScanAt": {"$lte": now},
+                        "scanLockUntil": {"$gte": now}
+                    },
+                    {"scanLockUntil": 1},
+                    sort=[("scanLockUntil", 1)]
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error finding next due watch: {str(e)}")
+            return SCHEDULER_CHECK_INTERVAL_SECONDS
+        
+        delay = max_sleep
+        if next_doc:
+            delay = min(delay, (_as_utc(next_doc["nextScanAt"]) - now).total_seconds())
+        if leased_doc:
+            delay = min(delay, (_as_utc(leased_doc["scanLockUntil"]) - now).total_seconds())
+        return max(SCHEDULER_MIN_SLEEP_SECONDS, delay)
+    
+    async def _watch_changes(self) -> None:
+        """
+        Wake the scheduler loop when a watch becomes due before its next wakeup.
+        
+        Follows a change stream on the watches collection for inserts and
+        nextScanAt updates. Change streams need a replica set; on a
+        standalone server this task exits and the loop keeps polling every
+        SCHEDULER_CHECK_INTERVAL_SECONDS.
+        """
+        resume_token = None
+        
+        while self._running:
+            try:
+                async with self.db.watches.watch(
+                    _WATCH_CHANGES_PIPELINE,
+                    resume_after=resume_token
+                ) as stream:
+                    self._change_stream_open = True
+                    logger.info("Watching watches collection for schedule changes")
+                    
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        next_scan_at = change.get("nextScanAt")
+                        if not isinstance(next_scan_at, datetime):
+                            continue
+                        if self._next_wake_at is None or _as_utc(next_scan_at) < self._next_wake_at:
+                            self._wakeup.set()
+                
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == _CHANGE_STREAM_UNSUPPORTED:
+                    logger.info("Change streams unavailable, scheduler will poll for due watches")
+                    return
+                logger.error(f"Watches change stream failed: {str(e)}")
+                resume_token = None
+                await asyncio.sleep(SCHEDULER_CHECK_INTERVAL_SECONDS)
+            except Exception as e:
+                logger.error(f"Watches change stream failed: {str(e)}", exc_info=True)
+                await asyncio.sleep(SCHEDULER_CHECK_INTERVAL_SECONDS)
+            finally:
+                self._change_stream_open = False
+    
+    async def _flush_loop(self) -> None:
+        """Periodically write buffered updates and scan logs so they never sit for long."""
+        while self._running:
+            await asyncio.sleep(SCAN_LOG_FLUSH_INTERVAL_SECONDS)
+            await self._flush_watch_updates()
+            await self.processor.flush_scan_logs()
+    
+    async def _flush_watch_updates(self) -> None:
+        """
+        Write buffered post-scan watch updates with a single unordered bulk_write.
+        
+        Watches stay in the pending set until their update is written, so
+        the next tick cannot re-enqueue a watch whose nextScanAt is stale.
+        """
+        async with self._update_lock:
+            ops, self._watch_updates = self._watch_updates, []
+            ids, self._updated_ids = self._updated_ids, []
+            if not ops:
+                return
             
-            if watches:
-                logger.info(f"Found {len(watches)} watches due for scanning")
+            try:
+                await self.db.watches.bulk_write(ops, ordered=False)
+                logger.info(f"Wrote {len(ops)} watch updates")
+            except Exception as e:
+                logger.error(f"Failed to write {len(ops)} watch updates: {str(e)}", exc_info=True)
+            finally:
+                self._pending_ids.difference_update(ids)
+    
+    async def _worker(self, worker_id: int) -> None:
+        """
+        Worker loop that takes due watches off the queue and processes them.
+        
+        Args:
+            worker_id: Index of the worker, used for logging
+        """
+        logger.debug(f"Scan worker {worker_id} started")
+        
+        while self._running:
+            watch_doc = await self._queue.get()
+            try:
+                if not await self._process_watch_doc(watch_doc):
+                    self._pending_ids.discard(watch_doc["_id"])
+            finally:
+                # Free the slot so the loop can claim the next due watch
+                self._slots.release()
+                self._queue.task_done()
             
-            # Process each watch
-            for watch_doc in watches:
+            # Write updates once the batch is full; _flush_loop writes the rest.
+            # Claims wait for a free slot, so the queue is empty after nearly
+            # every scan and is no signal that a burst has finished.
+            if len(self._watch_updates) >= WATCH_UPDATE_BATCH_SIZE:
+                await self._flush_watch_updates()
+    
+    async def _process_due_watches(self) -> None:
+        """
+        Claim watches that are due for scanning as worker slots free up.
+        
+        Each active watch where nextScanAt <= now is claimed with an atomic
+        find_one_and_update that sets a scanLockUntil lease, so when several
+        app processes run a scheduler each watch is scanned by exactly one
+        of them. A watch is only claimed once a worker slot is free, so its
+        lease starts when its scan does and idle instances can claim the
+        rest of the backlog. Workers process claimed watches, update
+        nextScanAt based on the watch's frequency and clear the lease.
+        """
+        try:
+            enqueued = 0
+            while self._running:
+                await self._slots.acquire()
+                now = datetime.now(timezone.utc)
+                lease_until = now + timedelta(
+                    seconds=self._scan_timeout + SCAN_LEASE_MARGIN_SECONDS
+                )
+                
                 try:
-                    # Convert to WatchInDB model
-                    watch = WatchInDB(
-                        _id=str(watch_doc["_id"]),
-                        userId=watch_doc["userId"],
-                        propertyId=watch_doc["propertyId"],
-                        propertyName=watch_doc["propertyName"],
-                        propertyUrl=watch_doc["propertyUrl"],
-                        location=watch_doc["location"],
-                        checkInDate=watch_doc["checkInDate"],
-                        checkOutDate=watch_doc["checkOutDate"],
-                        guests=watch_doc["guests"],
-                        price=watch_doc["price"],
-                        frequency=watch_doc["frequency"],
-                        partialMatch=watch_doc["partialMatch"],
-                        status=watch_doc["status"],
-                        lastScannedAt=watch_doc.get("lastScannedAt"),
-                        nextScanAt=watch_doc.get("nextScanAt"),
-                        expiresAt=watch_doc["expiresAt"],
-                        createdAt=watch_doc["createdAt"],
-                        updatedAt=watch_doc["updatedAt"]
-                    )
-                    
-                    # Process the watch
-                    await self.processor.process_watch(watch)
-                    
-                    # Calculate next scan time based on frequency
-                    next_scan_at = self._calculate_next_scan_time(
-                        watch.frequency,
-                        now
-                    )
-                    
-                    # Update nextScanAt in database
-                    await self.db.watches.update_one(
-                        {"_id": watch_doc["_id"]},
+                    # Served by the partial (status, nextScanAt) index from ensure_indexes
+                    watch_doc = await self.db.watches.find_one_and_update(
                         {
-                            "$set": {
-                                "nextScanAt": next_scan_at,
-                                "updatedAt": now
-                            }
-                        }
-                    )
-                    
-                    logger.info(
-                        f"Processed watch {watch.id}, next scan at {next_scan_at.isoformat()}"
+                            "status": "active",
+                            "nextScanAt": {"$lte": now},
+                            "$or": [
+                                {"scanLockUntil": {"$exists": False}},
+                                {"scanLockUntil": {"$lt": now}}
+                            ]
+                        },
+                        {"$set": {"scanLockUntil": lease_until}},
+                        projection=_DUE_WATCH_PROJECTION,
+                        sort=[("nextScanAt", 1)]
                     )
-                    
-                except Exception as e:
-                    logger.error(
-                        f"Error processing watch {watch_doc.get('_id')}: {str(e)}",
-                        exc_info=True
-                    )
-                    
+                except Exception:
+                    self._slots.release()
+                    raise
+                
+                if watch_doc is None:
+                    self._slots.release()
+                    break
+                
+                # A lease can expire while this process still has the watch's
+                # update buffered
+                if watch_doc["_id"] in self._pending_ids:
+                    self._slots.release()
+                    continue
+                
+                # Hand the watch to a free worker; the slot is released when it finishes
+                self._pending_ids.add(watch_doc["_id"])
+                self._queue.put_nowait(watch_doc)
+                enqueued += 1
+            
+            if enqueued:
+                logger.info(f"Enqueued {enqueued} watches due for scanning")
+            
         except Exception as e:
-            logger.error(f"Error querying due watches: {str(e)}", exc_info=True)
+            logger.error(f"Error claiming due watches: {str(e)}", exc_info=True)
     
-    def _calculate_next_scan_time(
-        self,
-        frequency: str,
-        base_time: datetime
-    ) -> datetime:
+    async def _process_watch_doc(self, watch_doc: dict) -> bool:
         """
-        Calculate the next scan time based on frequency tier.
+        Process a single due watch and buffer its post-scan update.
+        
+        The scan result fields and the next scan time are merged into one
+        UpdateOne, written later by _flush_watch_updates. A scan that runs
+        past the scan timeout is cancelled and logged as an ERROR scan; the
+        watch stays active with an errorMessage and is rescheduled like any
+        other scan. Other errors are logged and swallowed so one failing
+        watch does not affect the others scanned in the same tick.
+        
+        Args:
+            watch_doc: Raw watch document from MongoDB
+            
+        Returns:
+            True if an update was buffered for the watch, False otherwise
+        """
+        try:
+            # Convert to WatchInDB model without re-validating trusted DB data.
+            # MongoDB stores the stay dates as datetimes, so narrow them to the
+            # date type the model declares.
+            fields = {field: watch_doc[field] for field in _WATCH_FIELDS if field in watch_doc}
+            fields["checkInDate"] = fields["checkInDate"].date()
+            fields["checkOutDate"] = fields["checkOutDate"].date()
+            watch = WatchInDB.model_construct(id=str(watch_doc["_id"]), **fields)
+            # Reuse the queried ObjectId instead of re-parsing the string id
+            watch._object_id = watch_doc["_id"]
+            
+            # Process the watch, cancelling scans stuck on a hung connection so
+            # they do not hold a worker indefinitely
+            try:
+                update_data = await asyncio.wait_for(
+                    self.processor.process_watch(watch),
+                    timeout=self._scan_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Scan of watch {watch.id} timed out after {self._scan_timeout}s"
+                )
+                now = datetime.now(timezone.utc)
+                error_message = f"Scan timed out after {self._scan_timeout}s"
+                # The cancelled scan wrote no log, so record the timeout in
+                # scan history like any other failed scan
+                await self.processor.log_failed_scan(
+                    watch,
+                    error_message,
+                    response_time_ms=int(self._scan_timeout * 1000),
+                    now=now
+                )
+                update_data = {
+                    "lastScannedAt": now,
+                    "updatedAt": now,
+                    "status": "active",
+                    "errorMessage": error_message
+                }
+            
+            # Buffer status, timestamps, the server-computed nextScanAt and the
+            # lease release as a single pipeline update; $literal keeps strings
+            # like errorMessage from being read as field paths
+            pipeline_set = {key: {"$literal": value} for key, value in update_data.items()}
+            pipeline_set["scanLockUntil"] = "$$REMOVE"
+            pipeline_set["nextScanAt"] = (
+                self._next_scan_expressions.get(watch.frequency)
+                or self._next_scan_expression(watch.frequency)
+            )
+            self._watch_updates.append(
+                UpdateOne({"_id": watch_doc["_id"]}, [{"$set": pipeline_set}])
+            )
+            self._updated_ids.append(watch_doc["_id"])
+            
+            logger.info(f"Processed watch {watch.id} ({watch.frequency})")
+            return True
+            
+        except Exception as e:
+            logger.error(
+                f"Error processing watch {watch_doc.get('_id')}: {str(e)}",
+                exc_info=True
+            )
+            return False
+    
+    def _next_scan_expression(self, frequency: str) -> Dict[str, Any]:
+        """
+        Build the aggregation expression for the next scan time.
+        
+        The expression is evaluated by MongoDB against $$NOW inside a
+        pipeline update, so no per-watch datetime math runs in Python.
+        Requires MongoDB 5.0+ ($dateAdd/$dateTrunc).
         
         Args:
             frequency: Scan frequency (daily, hourly, sniper)
-            base_time: Base time to calculate from (typically now)
             
         Returns:
-            Next scheduled scan datetime
+            Aggregation expression evaluating to the next scheduled scan datetime
         """
         if frequency == "daily":
             # Schedule for next day at configured hour
-            next_scan = base_time + timedelta(days=1)
-            next_scan = next_scan.replace(hour=DAILY_SCAN_HOUR, minute=0, second=0, microsecond=0)
-        elif frequency == "hourly":
-            # Schedule for next hour on the hour
-            next_scan = base_time + timedelta(hours=HOURLY_SCAN_INTERVAL_HOURS)
-            next_scan = next_scan.replace(minute=0, second=0, microsecond=0)
-        elif frequency == "sniper":
+            next_day = {"$dateAdd": {"startDate": "$$NOW", "unit": "day", "amount": 1}}
+            return {
+                "$dateAdd": {
+                    "startDate": {"$dateTrunc": {"date": next_day, "unit": "day"}},
+                    "unit": "hour",
+                    "amount": DAILY_SCAN_HOUR
+                }
+            }
+        if frequency == "sniper":
             # Schedule for configured minutes from now
-            next_scan = base_time + timedelta(minutes=SNIPER_SCAN_INTERVAL_MINUTES)
-        else:
+            return {"$dateAdd": {"startDate": "$$NOW", "unit": "minute", "amount": SNIPER_SCAN_INTERVAL_MINUTES}}
+        
+        if frequency != "hourly":
             # Default to hourly if unknown frequency
             logger.warning(f"Unknown frequency '{frequency}', defaulting to hourly")
-            next_scan = base_time + timedelta(hours=HOURLY_SCAN_INTERVAL_HOURS)
-            next_scan = next_scan.replace(minute=0, second=0, microsecond=0)
         
-        return next_scan
\ No newline at end of file
+        # Schedule for next hour on the hour
+        next_hour = {"$dateAdd": {"startDate": "$$NOW", "unit": "hour", "amount": HOURLY_SCAN_INTERVAL_HOURS}}
+        return {"$dateTrunc": {"date": next_hour, "unit": "hour"}}
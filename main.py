@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.db.mongodb import connect_to_mongodb, close_mongodb_connection, get_database
+from app.db.mongodb import connect_to_mongodb, close_mongodb_connection, get_database, ensure_indexes
 from app.api import api_router
 from app.core.config import settings
 from app.services.scheduler import SchedulerService
@@ -11,6 +11,8 @@ from app.services.notification.manager import NotificationManager
 from app.services.notification.email_provider import MockEmailProvider
 from app.services.notification.sms_provider import TwilioSMSProvider
 from app.integrations.apify_client import ApifyClient
+from app.integrations.browser_pool import get_browser_pool
+from app.services.property_fetcher import get_property_fetcher
 from app.models.notification import NotificationType
 import logging
 
@@ -35,6 +37,7 @@ async def lifespan(app: FastAPI):
     
     # Get database instance
     db = get_database()
+    await ensure_indexes(db)
     
     # Initialize notification providers
     email_provider = MockEmailProvider()
@@ -56,11 +59,22 @@ async def lifespan(app: FastAPI):
         client=apify_client
     )
     
+    # Optional Redis client for notification dedup across instances
+    redis_client = None
+    if settings.REDIS_URL:
+        try:
+            from redis.asyncio import Redis
+            redis_client = Redis.from_url(settings.REDIS_URL)
+            logger.info("Using Redis for notification dedup")
+        except ImportError:
+            logger.warning("REDIS_URL is set but redis is not installed, using in-process dedup")
+    
     # Initialize scan processor
     scan_processor = ScanProcessor(
         db=db,
         availability_checker=availability_checker,
-        notification_manager=notification_manager
+        notification_manager=notification_manager,
+        redis_client=redis_client
     )
     
     # Initialize and start scheduler
@@ -72,6 +86,12 @@ async def lifespan(app: FastAPI):
     logger.info("Starting scheduler...")
     scheduler.start()
     
+    # Optionally start the browser pool so the first property fetches skip
+    # cold start; otherwise browsers launch lazily on first use
+    if settings.BROWSER_WARMUP:
+        logger.info("Starting browser pool...")
+        await get_property_fetcher().warmup()
+    
     # Store scheduler in app state for access if needed
     app.state.scheduler = scheduler
     
@@ -82,7 +102,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down BnBAlerts API...")
     logger.info("Stopping scheduler...")
-    scheduler.stop()
+    await scheduler.stop()
+    scan_processor.close()
+    logger.info("Closing browser and HTTP clients...")
+    await get_browser_pool().stop()
+    await get_property_fetcher().aclose()
+    if redis_client is not None:
+        await redis_client.aclose()
     await close_mongodb_connection()
 
 